@@ -0,0 +1,139 @@
+"""
+per-call python overhead of building argv & calling _run():
+public functions (argv builders compiled once from the command specs)
+vs the former dict-based builders.
+
+run: python benchmarks/bench_argv.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import termux_api  # noqa: E402
+
+
+def _construct_args(command, flags={}, kwargs={}, args=[]):
+    res = command
+    for k, v in flags.items():
+        if v:
+            res.append(k)
+    for k, v in kwargs.items():
+        if v is None:
+            continue
+        res.append(k)
+        if v is True:
+            res.append("true")
+        elif v is False:
+            res.append("false")
+        else:
+            res.append(v)
+    res.extend(args)
+    # the former _run() converted every element
+    return [str(i) for i in res]
+
+
+def legacy_toast(
+    text, position="middle", short=False, text_color="white", background_color="gray"
+):
+    return _construct_args(
+        ["termux-toast"],
+        {"-s": short},
+        {"-g": position, "-c": text_color, "-b": background_color},
+        [text],
+    )
+
+
+def legacy_notification(title=None, content=None, id=None, vibrate=None):
+    return _construct_args(
+        ["termux-notification"],
+        {"--alert-once": False, "--ongoing": False, "--sound": False},
+        {
+            "--action": None,
+            "--button1": None,
+            "--button1-action": None,
+            "--button2": None,
+            "--button2-action": None,
+            "--button3": None,
+            "--button3-action": None,
+            "--content": content,
+            "--group": None,
+            "--id": id,
+            "--image-path": None,
+            "--led-color": None,
+            "--led-off": None,
+            "--led-on": None,
+            "--on-delete": None,
+            "--priority": None,
+            "--title": title,
+            "--vibrate": termux_api._join_list(vibrate),
+            "--type": None,
+            "--media-next": None,
+            "--media-pause": None,
+            "--media-play": None,
+            "--media-previous": None,
+        },
+    )
+
+
+def legacy_job_scheduler(script_path, job_id=None):
+    return _construct_args(
+        ["termux-job-scheduler"],
+        {},
+        {
+            "-s": script_path,
+            "--job-id": job_id,
+            "--period-ms": 0,
+            "--network": "any",
+            "--battery-not-low": True,
+            "--storage-not-low": False,
+            "--charging": False,
+            "--persisted": False,
+            "--trigger-content-uri": None,
+            "--trigger-content-flag": 1,
+        },
+    )
+
+
+def legacy_battery_status():
+    return [str(i) for i in ["termux-battery-status"]]
+
+
+CASES = [
+    ("battery_status", legacy_battery_status, (), {}),
+    ("toast", legacy_toast, ("hello",), {"position": "top"}),
+    ("notification", legacy_notification, (), {"title": "t", "content": "c"}),
+    ("job_scheduler", legacy_job_scheduler, ("/s.sh",), {"job_id": 1}),
+]
+
+
+def _argv(args, **kwargs):
+    # stands in for termux_api._run(): return argv as the error instead of running it
+    return None, args
+
+
+def main(number=100000):
+    termux_api._run = _argv
+    for name, legacy, args, kwargs in CASES:
+        function = getattr(termux_api, name)
+        assert function(*args, **kwargs)[1] == legacy(*args, **kwargs), name
+        # both go through _run() once, like the former _run_json() / _run_error()
+        timers = [
+            timeit.Timer(lambda: _argv(legacy(*args, **kwargs))),
+            timeit.Timer(lambda: function(*args, **kwargs)),
+        ]
+        # alternated, so that both see the same load
+        times = [float("inf")] * 2
+        for _ in range(7):
+            for i, timer in enumerate(timers):
+                times[i] = min(times[i], timer.timeit(number) / number * 1e6)
+        print(
+            f"{name:16} legacy {times[0]:6.2f}us  function {times[1]:6.2f}us"
+            f"  {times[0] / times[1]:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
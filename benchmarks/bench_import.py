@@ -0,0 +1,81 @@
+"""
+startup cost of short-lived scripts: import time of termux_api,
+modules loaded by the import, and wall time of `python -m termux_api`.
+fails if the import loads a module that must stay lazy, or takes longer than --max-ms.
+
+run: python benchmarks/bench_import.py [--max-ms 50]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# only imported on the code paths that need them
+LAZY = ("asyncio", "inspect", "json", "numpy", "tempfile", "typing")
+CHILD = """
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import termux_api
+print((time.perf_counter() - start) * 1000, *sorted(set(sys.modules) - before))
+"""
+
+
+def _env():
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # measure with the bytecode cache, as installed scripts run
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_time(repeat):
+    """return (min import ms, modules loaded by the import)"""
+    times, modules = [], []
+    for _ in range(repeat + 1):
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD],
+            env=_env(),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        modules = out[1:]
+    # the first run writes the bytecode cache
+    return min(times[1:]), modules
+
+
+def wall_time(args, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=_env(), capture_output=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-ms", type=float, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    opts = parser.parse_args()
+
+    ms, modules = import_time(opts.repeat)
+    eager = [m for m in LAZY if m in modules]
+    python = wall_time(["-c", "pass"], opts.repeat)
+    cli = wall_time(["-m", "termux_api", "--help"], opts.repeat)
+    print(f"import termux_api       {ms:6.1f}ms")
+    print(f"python -c pass          {python:6.1f}ms")
+    print(f"python -m termux_api -h {cli:6.1f}ms")
+    print(f"modules loaded: {len(modules)}, lazy modules loaded: {eager or 'none'}")
+    if eager or ms > opts.max_ms:
+        print(f"FAIL: import must stay under {opts.max_ms}ms without {LAZY}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
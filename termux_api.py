@@ -6,13 +6,24 @@ Official wiki: https://wiki.termux.com/wiki/Termux:API
 
 from __future__ import annotations
 
+# json, re, asyncio, numpy... are imported where needed, keeping startup fast
 import atexit
-import json
-import re
+import math
+import mmap
+import os
+import struct
 import subprocess
-from json import JSONDecodeError
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
 from subprocess import CalledProcessError
-from typing import Any, Optional
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from json import JSONDecodeError
+    from typing import Any, Callable, Optional
 
 _all_popen = []
 
@@ -25,80 +36,103 @@ def _kill_all_popen():
 atexit.register(_kill_all_popen)
 
 
-def _run(args, **kwargs) -> tuple[Optional[str], Optional[CalledProcessError]]:
-    args = [str(i) for i in args]
+def _run(args, **kwargs) -> tuple[Optional[str], Optional[Exception]]:
+    """args must be strings"""
     try:
         proc = subprocess.run(
             args, capture_output=True, check=True, text=True, **kwargs
         )
         return proc.stdout, None
-    except CalledProcessError as err:
+    except (CalledProcessError, subprocess.TimeoutExpired) as err:
         return None, err
 
 
-def _run_json(
-    args, **kwargs
-) -> tuple[Any, Optional[CalledProcessError | JSONDecodeError]]:
-    stdout, err = _run(args, **kwargs)
-    if err:
-        return None, err
+async def _arun(args, timeout=None) -> tuple[Optional[str], Optional[Exception]]:
+    import asyncio
+
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None, subprocess.TimeoutExpired(args, timeout)
+    if proc.returncode:
+        return None, CalledProcessError(
+            proc.returncode, args, stdout.decode(), stderr.decode()
+        )
+    return stdout.decode(), None
+
+
+def _parse_raw(stdout) -> tuple[str, None]:
+    return stdout, None
+
+
+def _parse_json(stdout) -> tuple[Any, Optional[JSONDecodeError]]:
+    import json
+
     try:
         return json.loads(stdout), None
-    except JSONDecodeError as err:
+    except json.JSONDecodeError as err:
         return None, err
 
 
-def _run_error(args, **kwargs) -> tuple[None, Optional[CalledProcessError | str]]:
-    stdout, err = _run(args, **kwargs)
-    if err:
-        return None, err
+def _parse_error(stdout) -> tuple[None, Optional[str]]:
     if stdout.strip():
         return None, stdout
     else:
         return None, None
 
 
-def _run_startswith_error(
-    args, startswith, is_error=False, **kwargs
-) -> tuple[None, Optional[CalledProcessError | str]]:
-    stdout, err = _run(args, **kwargs)
-    if err:
-        return None, err
-    if stdout.startswith(startswith) == is_error:
-        return None, stdout
-    else:
-        return None, None
+def _parse_startswith_error(startswith, is_error=False):
+    def parse(stdout) -> tuple[None, Optional[str]]:
+        if stdout.startswith(startswith) == is_error:
+            return None, stdout
+        else:
+            return None, None
 
+    return parse
 
-def _run_startswith_map(
-    args, mapping, default=None, **kwargs
-) -> tuple[Optional[Any], Optional[CalledProcessError]]:
-    stdout, err = _run(args, **kwargs)
-    if err:
-        return None, err
-    for k, v in mapping.items():
-        if stdout.startswith(k):
-            return v, None
-    return default, None
 
+def _parse_startswith_map(mapping, default=None):
+    def parse(stdout) -> tuple[Optional[Any], None]:
+        for k, v in mapping.items():
+            if stdout.startswith(k):
+                return v, None
+        return default, None
 
-def _run_regex(
-    args, regex, types, **kwargs
-) -> tuple[Optional[Any], Optional[CalledProcessError]]:
-    stdout, err = _run(args, **kwargs)
-    if err:
-        return None, err
-    m = re.match(regex, stdout)
-    if m is None:
-        return None, None
-    if type(types) is list:
-        return [t(g) for t, g in zip(types, m.groups())], None
-    else:
-        return types(m.groups()[0]), None
+    return parse
+
+
+def _parse_regex(regex, types):
+    def parse(stdout) -> tuple[Optional[Any], None]:
+        import re
+
+        m = re.match(regex, stdout)
+        if m is None:
+            return None, None
+        if type(types) is list:
+            return [t(g) for t, g in zip(types, m.groups())], None
+        else:
+            return types(m.groups()[0]), None
+
+    return parse
+
+
+def _parse_media_player_info(stdout) -> tuple[dict, None]:
+    if stdout.startswith("No track currently"):
+        return {"Track": None}, None
+    res = dict(
+        [line.split(": ", maxsplit=1) for line in stdout.split("\n") if ":" in line]
+    )
+    return res, None
 
 
 def _run_updates(args, **kwargs):
-    args = [str(i) for i in args]
+    import json
+
     popen = subprocess.Popen(
         args, bufsize=1, stdout=subprocess.PIPE, text=True, **kwargs
     )
@@ -109,7 +143,7 @@ def _run_updates(args, **kwargs):
         try:
             yield json.loads(buffer), None
             buffer = ""
-        except JSONDecodeError:
+        except json.JSONDecodeError:
             pass
     popen.stdout.close()
     return_code = popen.wait()
@@ -118,23 +152,120 @@ def _run_updates(args, **kwargs):
         yield None, CalledProcessError(return_code, args)
 
 
-def _construct_args(command: list[str], flags={}, kwargs={}, args=[]):
-    res = command
-    for k, v in flags.items():
-        if v:
-            res.append(k)
-    for k, v in kwargs.items():
-        if v is None:
-            continue
-        res.append(k)
-        if v is True:
-            res.append("true")
-        elif v is False:
-            res.append("false")
-        else:
-            res.append(v)
-    res.extend(args)
-    return res
+def _read_available(fd) -> bytes:
+    """read a non-blocking fd until it would block or is closed"""
+    chunks = []
+    while True:
+        try:
+            chunk = os.read(fd, 1 << 16)
+        except BlockingIOError:
+            break
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _run_capture(
+    args, buffer=None, max_size=32 << 20, timeout=None
+) -> tuple[Optional[memoryview], Optional[Exception | str]]:
+    """
+    run args + [fifo], return (memoryview of what was written to the fifo, error).
+    read into buffer if given, else into a bytearray of at most max_size bytes.
+    the file may be written after the command exits, so wait until it is closed
+    after writing, unless the command exits with an error (or output) before that.
+    """
+    import select
+    import tempfile
+
+    data = bytearray() if buffer is None else buffer
+    view = memoryview(data).cast("B")
+    limit = max_size if buffer is None else len(view)
+    # one more byte is read into probe when view is full, to tell eof from overflow
+    size, probe = 0, bytearray(1)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with tempfile.TemporaryDirectory() as tmp:
+        fifo = os.path.join(tmp, "capture")
+        os.mkfifo(fifo)
+        fd = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            args = [str(i) for i in args + [fifo]]
+            popen = subprocess.Popen(args, stdout=subprocess.PIPE)
+            _all_popen.append(popen)
+            os.set_blocking(popen.stdout.fileno(), False)
+            # a fifo that no writer has opened yet is not readable (linux),
+            # once opened it is readable on data, and on eof after the writer closes it
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            stdout, exited, err = b"", False, None
+            while True:
+                if size == len(view) and size < limit:
+                    # no views of data may exist while it is resized
+                    view.release()
+                    data.extend(bytes(min(max(size, 1 << 16), limit - size)))
+                    view = memoryview(data)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    err = subprocess.TimeoutExpired(args, timeout)
+                    break
+                # poll the command until it exits
+                wait = remaining if exited else min(remaining or 0.05, 0.05)
+                if poller.poll(None if wait is None else math.ceil(wait * 1000)):
+                    try:
+                        count = os.readv(
+                            fd, [view[size:] if size < len(view) else probe]
+                        )
+                    except BlockingIOError:
+                        continue
+                    if not count and not size:
+                        # closed without writing (e.g. touched), wait for a writer
+                        reopened = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+                        poller.unregister(fd)
+                        os.close(fd)
+                        fd = reopened
+                        poller.register(fd, select.POLLIN)
+                        continue
+                    if not count:
+                        break
+                    if size == len(view):
+                        err = f"capture exceeds {limit} bytes"
+                        break
+                    size += count
+                    continue
+                if not exited and popen.poll() is not None:
+                    exited = True
+                    stdout += _read_available(popen.stdout.fileno())
+                    if popen.returncode or stdout.strip():
+                        break
+        finally:
+            os.close(fd)
+        os.set_blocking(popen.stdout.fileno(), True)
+        remaining = None if deadline is None else deadline - time.monotonic()
+        try:
+            rest, _ = popen.communicate(timeout=remaining and max(remaining, 1))
+            stdout += rest
+        except subprocess.TimeoutExpired as timeout_err:
+            popen.kill()
+            popen.wait()
+            popen.stdout.close()
+            err = err or timeout_err
+        _all_popen.remove(popen)
+    stdout = stdout.decode(errors="replace")
+    if err is None and popen.returncode:
+        err = CalledProcessError(popen.returncode, args, stdout)
+    elif err is None and stdout.strip():
+        err = stdout
+    if err:
+        return None, err
+    return view[:size], None
+
+
+def _str(value) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
 
 
 def _join_list(lis):
@@ -143,143 +274,677 @@ def _join_list(lis):
     return ",".join(str(i) for i in lis)
 
 
+def _on_off(on):
+    return "on" if on else "off"
+
+
+def _true_false(value):
+    return "true" if value else "false"
+
+
+def _sensor_args(sensors):
+    if sensors is None:
+        return ["-a"]
+    return ["-s", _join_list(sensors)]
+
+
+_CONVERTERS = {
+    "join": _join_list,
+    "on_off": _on_off,
+    "true_false": _true_false,
+    "sensors": _sensor_args,
+}
+
+
+class _Spec(
+    namedtuple(
+        "_Spec",
+        "name template parse choices updates run_kwargs",
+        defaults=(_parse_error, None, None, ()),
+    )
+):
+    """
+    a termux command, run by the function of the same name through _runners.
+    template: argv tokens in order, name may be suffixed by |converter (_CONVERTERS):
+    word: constant, -f?name: -f if name, -o=name: -o name if name is not None,
+    {name}: name if not None, {*name}: items of name.
+    parse: stdout -> (result, error), None to only build argv.
+    choices: {name: allowed values}, other values are returned as ValueError.
+    updates: True, or values -> True, to yield (result, error) from _run_updates().
+    run_kwargs: parameters passed to _run() instead of argv, e.g. timeout.
+    """
+
+    __slots__ = ()
+
+
+_SPECS = (
+    _Spec("battery_status", "termux-battery-status", _parse_json),
+    _Spec("brightness", "termux-brightness {brightness}"),
+    _Spec("call_log", "termux-call-log -o=offset -l=limit", _parse_json),
+    _Spec("camera_info", "termux-camera-info", _parse_json),
+    _Spec("camera_photo", "termux-camera-photo -c=camera_id {output_file}"),
+    _Spec("clipboard_get", "termux-clipboard-get", _parse_raw),
+    _Spec("clipboard_set", "termux-clipboard-set {text}"),
+    _Spec("contact_list", "termux-contact-list", _parse_json),
+    _Spec("dialog_list", "termux-dialog -l", _parse_raw),
+    _Spec("dialog_confirm", "termux-dialog confirm -t=title -i=hint", _parse_json),
+    _Spec(
+        "dialog_checkbox", "termux-dialog checkbox -t=title -v=values|join", _parse_json
+    ),
+    _Spec(
+        "dialog_counter", "termux-dialog counter -t=title -r=range|join", _parse_json
+    ),
+    _Spec("dialog_date", "termux-dialog date -t=title -d=date_format", _parse_json),
+    _Spec("dialog_radio", "termux-dialog radio -t=title -v=values|join", _parse_json),
+    _Spec("dialog_sheet", "termux-dialog sheet -t=title -v=values|join", _parse_json),
+    _Spec(
+        "dialog_spinner", "termux-dialog spinner -t=title -v=values|join", _parse_json
+    ),
+    _Spec("dialog_speech", "termux-dialog speech -t=title -i=hint", _parse_json),
+    _Spec(
+        "dialog_text",
+        "termux-dialog text -m?multi_line -n?number -p?password -t=title -i=hint",
+        _parse_json,
+    ),
+    _Spec("dialog_time", "termux-dialog time -t=title", _parse_json),
+    _Spec("download", "termux-download -p=path -t=title -d=description {url}"),
+    _Spec("fingerprint", "termux-fingerprint", _parse_json),
+    _Spec("infrared_frequencies", "termux-infrared-frequencies", _parse_json),
+    _Spec("infrared_transmit", "termux-infrared-transmit -f=frequency {pattern|join}"),
+    _Spec("job_scheduler_list", "termux-job-scheduler -p", _parse_raw),
+    _Spec("job_scheduler_cancel", "termux-job-scheduler --cancel {job_id}", _parse_raw),
+    _Spec("job_scheduler_cancel_all", "termux-job-scheduler --cancel-all", _parse_raw),
+    _Spec(
+        "job_scheduler",
+        "termux-job-scheduler -s=script_path --job-id=job_id --period-ms=period_ms "
+        "--network=network --battery-not-low=battery_not_low "
+        "--storage-not-low=storage_not_low --charging=charging --persisted=persisted "
+        "--trigger-content-uri=trigger_content_uri "
+        "--trigger-content-flag=trigger_content_flag",
+        _parse_raw,
+        choices={"network": ("any", "unmetered", "cellular", "not_roaming", "none")},
+    ),
+    _Spec(
+        "location",
+        "termux-location -p=provider -r=request",
+        _parse_json,
+        choices={
+            "provider": ("gps", "network", "passive"),
+            "request": ("once", "last", "updates"),
+        },
+        updates=lambda values: values["request"] == "updates",
+    ),
+    _Spec("media_player_info", "termux-media-player info", _parse_media_player_info),
+    _Spec(
+        "media_player_play",
+        "termux-media-player play {file}",
+        _parse_startswith_error("Now Playing"),
+    ),
+    _Spec(
+        "media_player_pause",
+        "termux-media-player pause",
+        _parse_startswith_map(
+            {
+                "Paused playback": True,
+                "Playback already paused": None,
+                "No track to pause": False,
+            }
+        ),
+    ),
+    _Spec(
+        "media_player_resume",
+        "termux-media-player play",
+        _parse_startswith_map(
+            {
+                "Resumed playback": True,
+                "Already playing track": None,
+                "No previous track to resume": False,
+            }
+        ),
+    ),
+    _Spec(
+        "media_player_stop",
+        "termux-media-player stop",
+        _parse_startswith_map(
+            {
+                "Stopped playback": True,
+                "No track to stop": False,
+            }
+        ),
+    ),
+    # -v just prints all files out, including non-media files
+    _Spec(
+        "media_scan",
+        "termux-media-scan -r?recursive -v?verbose {*files}",
+        _parse_regex("Finished scanning ([0-9]+) file", int),
+    ),
+    _Spec(
+        "microphone_record",
+        "termux-microphone-record -d?default -f=file -l=limit -e=encoder -b=bitrate "
+        "-r=sample_rate -c=channel_count",
+        _parse_startswith_error("Recording started"),
+    ),
+    _Spec("microphone_record_info", "termux-microphone-record -i", _parse_json),
+    _Spec(
+        "microphone_record_quit",
+        "termux-microphone-record -q",
+        _parse_startswith_map(
+            {"Recording finished": True, "No recording to stop": False}
+        ),
+    ),
+    _Spec(
+        "notification",
+        "termux-notification --alert-once?alert_once --ongoing?pin --sound?sound "
+        "--action=action --button1=button1 --button1-action=button1_action "
+        "--button2=button2 --button2-action=button2_action "
+        "--button3=button3 --button3-action=button3_action "
+        "--content=content --group=group --id=id --image-path=image "
+        "--led-color=led_color --led-off=led_off --led-on=led_on "
+        "--on-delete=delete_action --priority=priority --title=title "
+        "--vibrate=vibrate|join --type=type --media-next=media_next "
+        "--media-pause=media_pause --media-play=media_play "
+        "--media-previous=media_previous",
+    ),
+    _Spec("notification_remove", "termux-notification-remove {id}"),
+    _Spec(
+        "sensor",
+        "termux-sensor {*sensors|sensors} -d=delay -n=times",
+        _parse_json,
+        updates=True,
+    ),
+    _Spec(
+        "sensor_cleanup",
+        "termux-sensor -c",
+        _parse_startswith_map(
+            {
+                "Sensor cleanup successful": True,
+                "Sensor cleanup unnecessary": False,
+            }
+        ),
+    ),
+    _Spec("sensor_list", "termux-sensor -l", _parse_json),
+    _Spec("sensor_once", "termux-sensor {*sensors|sensors} -n 1", _parse_json),
+    _Spec(
+        "share",
+        "termux-share -d?default_receiver -a=action -c=content_type -t=title {file}",
+        choices={"action": ("edit", "send", "view")},
+    ),
+    _Spec(
+        "sms_list",
+        "termux-sms-list -d?show_date -n?show_number -l=limit -o=offset "
+        "-t=message_type",
+        _parse_json,
+        choices={"message_type": ("all", "inbox", "sent", "draft", "outbox")},
+    ),
+    _Spec("sms_send", "termux-sms-send -n=numbers|join -s=sim_slot {text}"),
+    _Spec("storage_get", "termux-storage-get {output_file}"),
+    _Spec("telephony_call", "termux-telephony-call {number}"),
+    _Spec("telephony_cellinfo", "termux-telephony-cellinfo", _parse_json),
+    _Spec("telephony_deviceinfo", "termux-telephony-deviceinfo", _parse_json),
+    _Spec(
+        "toast",
+        "termux-toast -s?short -g=position -c=text_color -b=background_color {text}",
+        choices={"position": ("top", "middle", "bottom")},
+    ),
+    _Spec("torch", "termux-torch {on|on_off}"),
+    _Spec("tts_engines", "termux-tts-engines", _parse_json),
+    _Spec(
+        "tts_speak",
+        "termux-tts-speak -e=engine -l=language -n=region -v=variant -p=pitch "
+        "-r=rate -s=stream {text}",
+        run_kwargs=("timeout",),
+    ),
+    _Spec(
+        "tts_speak_init",
+        "termux-tts-speak -e=engine -l=language -n=region -v=variant -p=pitch "
+        "-r=rate -s=stream",
+        None,
+    ),
+    _Spec("usb", "termux-usb -r?permission_dialog -e=execute_command {device}"),
+    _Spec("usb_list", "termux-usb -l", _parse_json),
+    _Spec("vibrate", "termux-vibrate -f?force -d=duration"),
+    _Spec("volume_get", "termux-volume", _parse_json),
+    _Spec("volume_set", "termux-volume {stream} {volume}"),
+    _Spec("wallpaper", "termux-wallpaper -l?lockscreen -f=file -u=url"),
+    _Spec("wifi_connectioninfo", "termux-wifi-connectioninfo", _parse_json),
+    _Spec("wifi_enable", "termux-wifi-enable {enable|true_false}"),
+    _Spec("wifi_scaninfo", "termux-wifi-scaninfo", _parse_json),
+)
+
+# kinds of template tokens
+_CONSTANT, _FLAG, _OPTION, _POSITIONAL, _EXTEND = range(5)
+
+
+def _parse_template(template):
+    """return (constant argv prefix, [(kind, word, name, converter)] of the rest)"""
+    prefix, steps = [], []
+    for token in template.split():
+        if "?" in token:
+            flag, name = token.split("?")
+            steps.append((_FLAG, flag, name, None))
+            continue
+        option, _, value = token.rpartition("=")
+        positional = value.startswith("{")
+        if not option and not positional:
+            if steps:
+                steps.append((_CONSTANT, token, None, None))
+            else:
+                prefix.append(token)
+            continue
+        value = value.strip("{}")
+        kind = _EXTEND if value.startswith("*") else _OPTION
+        if positional and kind == _OPTION:
+            kind = _POSITIONAL
+        name, _, converter = value.lstrip("*").partition("|")
+        steps.append(
+            (kind, option, name, _CONVERTERS[converter] if converter else None)
+        )
+    return prefix, steps
+
+
+def _parameters(name):
+    """parameter names of function name, the order of the arguments of its command"""
+    code = globals()[name].__code__
+    return code.co_varnames[: code.co_argcount]
+
+
+def _compile(spec: _Spec):
+    """
+    return argv(args) of spec, building argv from the argument values of its function.
+    the template is parsed once here into one pass per kind of token, flags & options
+    come before positionals. constants after the prefix are options (sensor_once's
+    -n 1), they join the prefix. argv() raises ValueError for invalid choices.
+    """
+    prefix, steps = _parse_template(spec.template)
+    prefix += [word for kind, word, _, _ in steps if kind == _CONSTANT]
+    index = {name: i for i, name in enumerate(_parameters(spec.name))}
+    flags, options, converted_options = [], [], []
+    positionals, converted_positionals, extends = [], [], []
+    for kind, word, name, converter in steps:
+        if kind == _FLAG:
+            flags.append((index[name], word))
+        elif kind == _OPTION and converter is None:
+            options.append((index[name], word))
+        elif kind == _OPTION:
+            # converters of options keep None
+            converted_options.append((index[name], word, converter))
+        elif kind == _POSITIONAL and converter is None:
+            positionals.append(index[name])
+        elif kind == _POSITIONAL:
+            converted_positionals.append((index[name], converter))
+        elif kind == _EXTEND:
+            extends.append((index[name], converter or (lambda value: value)))
+    choices = [
+        (index[name], tuple(values), f"{name} must be one of {', '.join(values)}, got ")
+        for name, values in (spec.choices or {}).items()
+    ]
+
+    if not steps:
+
+        def argv(args):
+            return prefix[:]
+
+    else:
+
+        def argv(args):
+            argv = prefix[:]
+            for i, word in flags:
+                if args[i]:
+                    argv.append(word)
+            for i, word in options:
+                value = args[i]
+                if value is None:
+                    continue
+                # _str() inlined, options are most of the tokens
+                if value is True:
+                    value = "true"
+                elif value is False:
+                    value = "false"
+                elif value.__class__ is not str:
+                    value = str(value)
+                argv += (word, value)
+            for i, word, converter in converted_options:
+                value = args[i]
+                if value is not None:
+                    argv += (word, _str(converter(value)))
+            for i in positionals:
+                value = args[i]
+                if value is not None:
+                    argv.append(value if value.__class__ is str else _str(value))
+            for i, converter in converted_positionals:
+                value = converter(args[i])
+                if value is not None:
+                    argv.append(_str(value))
+            for i, converter in extends:
+                value = converter(args[i])
+                if value is not None:
+                    argv += map(_str, value)
+            return argv
+
+    if choices:
+        build = argv
+
+        def argv(args):
+            for i, allowed, message in choices:
+                value = args[i]
+                if value is not None and value not in allowed:
+                    raise ValueError(message + repr(value))
+            return build(args)
+
+    return argv
+
+
+_SPECS_BY_NAME = {spec.name: spec for spec in _SPECS}
+# {name: (argv builder, spec)}, compiled on first use
+_COMMANDS: dict[str, tuple[Callable, _Spec]] = {}
+
+
+def _command(name):
+    """return (argv builder, spec) of a command, compiling it on first use"""
+    command = _COMMANDS.get(name)
+    if command is None:
+        spec = _SPECS_BY_NAME[name]
+        command = _COMMANDS[name] = (_compile(spec), spec)
+    return command
+
+
+def _yields_updates(spec, values):
+    return spec.updates is True or (spec.updates is not None and spec.updates(values))
+
+
+def _call(name, args):
+    """
+    run command name with the argument values of its function, in parameter order.
+    return (result, error), or a generator of them if the command yields updates.
+    """
+    argv, spec = _command(name)
+    values = dict(zip(_parameters(name), args))
+    if _yields_updates(spec, values):
+        try:
+            return _run_updates(argv(args))
+        except ValueError as err:
+            return iter([(None, err)])
+    try:
+        command = argv(args)
+    except ValueError as err:
+        return None, err
+    stdout, err = _run(command, **{k: values[k] for k in spec.run_kwargs})
+    if err:
+        return None, err
+    return spec.parse(stdout)
+
+
+def _runner(name):
+    """return run(*args) of command name: _call() without lookups for most commands"""
+    argv, spec = _command(name)
+    if spec.updates is not None or spec.run_kwargs:
+        return lambda *args: _call(name, args)
+    parse = spec.parse
+    prefix, steps = _parse_template(spec.template)
+    if not steps:
+
+        def run():
+            stdout, err = _run(prefix[:])
+            if err:
+                return None, err
+            return parse(stdout)
+
+        return run
+
+    def run(*args):
+        try:
+            command = argv(args)
+        except ValueError as err:
+            return None, err
+        stdout, err = _run(command)
+        if err:
+            return None, err
+        return parse(stdout)
+
+    return run
+
+
+class _Runners:
+    """
+    _runner(name) by name, created on first access. the functions pass their
+    parameters in order, e.g. _runners.toast(text, position, short, ...)
+    """
+
+    def __getattr__(self, name):
+        run = _runner(name)
+        setattr(self, name, run)
+        return run
+
+
+_runners = _Runners()
+
+
+async def _acall(name, args):
+    """awaitable _call(), updates are not supported"""
+    argv, spec = _command(name)
+    values = dict(zip(_parameters(name), args))
+    if _yields_updates(spec, values):
+        return None, ValueError(f"only {name}() yields updates")
+    try:
+        command = argv(args)
+    except ValueError as err:
+        return None, err
+    stdout, err = await _arun(command, **{k: values[k] for k in spec.run_kwargs})
+    if err:
+        return None, err
+    return spec.parse(stdout)
+
+
+def _async_names():
+    """names of the awaitable variants of one-shot commands"""
+    return [
+        spec.name + "_async"
+        for spec in _SPECS
+        if spec.parse is not None and spec.updates is not True
+    ]
+
+
+def _async_function(name):
+    """return name_async, the awaitable variant of function name"""
+    import inspect
+
+    signature = inspect.signature(globals()[name])
+
+    async def function(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return await _acall(name, bound.args)
+
+    function.__name__ = function.__qualname__ = name + "_async"
+    function.__doc__ = f"awaitable {name}()"
+    function.__signature__ = signature
+    return function
+
+
+def __getattr__(name):
+    """create the awaitable variants of commands on first access"""
+    if name == "__all__":
+        names = [
+            k
+            for k, v in globals().items()
+            if not k.startswith("_") and getattr(v, "__module__", None) == __name__
+        ]
+        return names + [k for k in _async_names() if k not in names]
+    if name in _async_names():
+        function = globals()[name] = _async_function(name[: -len("_async")])
+        return function
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_async_names()})
+
+
+def batch(calls):
+    """
+    run one-shot calls concurrently, return [(result, error)] in the same order.
+    calls: [[function, args, kwargs]], args & kwargs are optional,
+    e.g. batch([[battery_status], [toast, ["hi"]], [vibrate, [], {"force": True}]])
+    invalid arguments & calls that would yield updates are returned as error.
+    """
+    import inspect
+
+    pending = []
+    for call in calls:
+        func, args, kwargs = call[0], [], {}
+        if len(call) > 1:
+            args = call[1]
+        if len(call) > 2:
+            kwargs = call[2]
+        spec = _SPECS_BY_NAME.get(func.__name__)
+        if spec is None or spec.parse is None or spec.updates is True:
+            raise ValueError(f"{func.__name__}() can not be batched")
+        argv = _command(spec.name)[0]
+        try:
+            values = inspect.signature(globals()[spec.name]).bind(*args, **kwargs)
+            values.apply_defaults()
+            if _yields_updates(spec, values.arguments):
+                raise ValueError(f"only {spec.name}() yields updates")
+            argv = argv(values.args)
+        except (TypeError, ValueError) as err:
+            pending.append((None, err))
+            continue
+        popen = subprocess.Popen(
+            argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        _all_popen.append(popen)
+        pending.append((spec.parse, popen))
+    results = []
+    for parse, popen in pending:
+        if parse is None:
+            # popen is the ValueError of an invalid argument
+            results.append((None, popen))
+            continue
+        stdout, stderr = popen.communicate()
+        _all_popen.remove(popen)
+        if popen.returncode:
+            err = CalledProcessError(popen.returncode, popen.args, stdout, stderr)
+            results.append((None, err))
+        else:
+            results.append(parse(stdout))
+    return results
+
+
 def battery_status():
-    return _run_json(["termux-battery-status"])
+    return _runners.battery_status()
 
 
 def brightness(brightness):
     """brightness: 0-255 or auto, require android.permission.WRITE_SETTINGS"""
-    return _run_error(["termux-brightness", brightness])
+    return _runners.brightness(brightness)
 
 
 def call_log(offset=0, limit=10):
     """not working on some devices even when permission is granted"""
-    return _run_json(["termux-call-log", "-o", offset, "-l", limit])
+    return _runners.call_log(offset, limit)
 
 
 def camera_info():
-    return _run_json(["termux-camera-info"])
+    return _runners.camera_info()
 
 
 def camera_photo(output_file, camera_id=0):
-    return _run_error(["termux-camera-photo", "-c", camera_id, output_file])
+    return _runners.camera_photo(output_file, camera_id)
+
+
+def camera_photo_bytes(camera_id=0, buffer=None, max_size=32 << 20, timeout=30):
+    """
+    return (memoryview of the jpeg, error), read from a fifo instead of a file.
+    buffer: writable buffer to read into, max_size is its length then.
+    """
+    args = ["termux-camera-photo", "-c", camera_id]
+    return _run_capture(args, buffer, max_size, timeout)
 
 
 def clipboard_get():
-    return _run(["termux-clipboard-get"])
+    return _runners.clipboard_get()
 
 
 def clipboard_set(text):
-    return _run_error(["termux-clipboard-set", text])
+    return _runners.clipboard_set(text)
 
 
 def contact_list():
-    return _run_json(["termux-contact-list"])
+    return _runners.contact_list()
 
 
 def dialog_list():
-    return _run(["termux-dialog", "-l"])
+    return _runners.dialog_list()
 
 
 def dialog_confirm(title=None, hint=None):
-    args = _construct_args(["termux-dialog", "confirm"], {}, {"-t": title, "-i": hint})
-    return _run_json(args)
+    return _runners.dialog_confirm(title, hint)
 
 
-def dialog_checkbox(title=None, values=[]):
-    args = _construct_args(
-        ["termux-dialog", "checkbox"], {}, {"-t": title, "-v": _join_list(values)}
-    )
-    return _run_json(args)
+def dialog_checkbox(title=None, values=()):
+    return _runners.dialog_checkbox(title, values)
 
 
 def dialog_counter(title=None, range=None):
     """range: [min, max, start]"""
-    args = _construct_args(
-        ["termux-dialog", "counter"], {}, {"-t": title, "-r": _join_list(range)}
-    )
-    return _run_json(args)
+    return _runners.dialog_counter(title, range)
 
 
 def dialog_date(title=None, date_format=None):
     """date_format: output SimpleDateFormat pattern, e.g. dd-MM-yyyy k:m:s"""
-    args = _construct_args(
-        ["termux-dialog", "date"], {}, {"-t": title, "-d": date_format}
-    )
-    return _run_json(args)
+    return _runners.dialog_date(title, date_format)
 
 
-def dialog_radio(title=None, values=[]):
-    args = _construct_args(
-        ["termux-dialog", "radio"], {}, {"-t": title, "-v": _join_list(values)}
-    )
-    return _run_json(args)
+def dialog_radio(title=None, values=()):
+    return _runners.dialog_radio(title, values)
 
 
-def dialog_sheet(title=None, values=[]):
-    args = _construct_args(
-        ["termux-dialog", "sheet"], {}, {"-t": title, "-v": _join_list(values)}
-    )
-    return _run_json(args)
+def dialog_sheet(title=None, values=()):
+    return _runners.dialog_sheet(title, values)
 
 
-def dialog_spinner(title=None, values=[]):
-    args = _construct_args(
-        ["termux-dialog", "spinner"], {}, {"-t": title, "-v": _join_list(values)}
-    )
-    return _run_json(args)
+def dialog_spinner(title=None, values=()):
+    return _runners.dialog_spinner(title, values)
 
 
 def dialog_speech(title=None, hint=None):
-    args = _construct_args(["termux-dialog", "speech"], {}, {"-t": title, "-i": hint})
-    return _run_json(args)
+    return _runners.dialog_speech(title, hint)
 
 
 def dialog_text(title=None, hint=None, multi_line=False, number=False, password=False):
-    args = _construct_args(
-        ["termux-dialog", "text"],
-        {"-m": multi_line, "-n": number, "-p": password},
-        {"-t": title, "-i": hint},
-    )
-    return _run_json(args)
+    return _runners.dialog_text(title, hint, multi_line, number, password)
 
 
 def dialog_time(title=None):
-    args = _construct_args(["termux-dialog", "time"], {}, {"-t": title})
-    return _run_json(args)
+    return _runners.dialog_time(title)
 
 
 def download(url, path=None, title=None, description=None):
-    args = _construct_args(
-        ["termux-download"], {}, {"-p": path, "-t": title, "-d": description}, [url]
-    )
-    return _run_error(args)
+    return _runners.download(url, path, title, description)
 
 
 def fingerprint():
-    return _run_json(["termux-fingerprint"])
+    return _runners.fingerprint()
 
 
 def infrared_frequencies():
-    return _run_json(["termux-infrared-frequencies"])
+    return _runners.infrared_frequencies()
 
 
 def infrared_transmit(frequency, pattern):
-    return _run_error(
-        ["termux-infrared-transmit", "-f", frequency, _join_list(pattern)]
-    )
+    return _runners.infrared_transmit(frequency, pattern)
 
 
 def job_scheduler_list():
-    return _run(["termux-job-scheduler", "-p"])
+    return _runners.job_scheduler_list()
 
 
 def job_scheduler_cancel(job_id=None):
-    return _run(["termux-job-scheduler", "--cancel", job_id])
+    return _runners.job_scheduler_cancel(job_id)
 
 
 def job_scheduler_cancel_all():
-    return _run(["termux-job-scheduler", "--cancel-all"])
+    return _runners.job_scheduler_cancel_all()
 
 
 def job_scheduler(
@@ -295,90 +960,179 @@ def job_scheduler(
     trigger_content_flag=1,
 ):
     """refer to: `termux-job-scheduler -h`"""
-    args = _construct_args(
-        ["termux-job-scheduler"],
-        {},
-        {
-            "-s": script_path,
-            "--job-id": job_id,
-            "--period-ms": period_ms,
-            "--network": network,
-            "--battery-not-low": battery_not_low,
-            "--storage-not-low": storage_not_low,
-            "--charging": charging,
-            "--persisted": persisted,
-            "--trigger-content-uri": trigger_content_uri,
-            "--trigger-content-flag": trigger_content_flag,
-        },
+    return _runners.job_scheduler(
+        script_path,
+        job_id,
+        period_ms,
+        network,
+        battery_not_low,
+        storage_not_low,
+        charging,
+        persisted,
+        trigger_content_uri,
+        trigger_content_flag,
     )
-    return _run(args)
+
+
+# android raises shorter periods to 15min
+_JOB_MIN_PERIOD_MS = 15 * 60 * 1000
+_JOB_FLAGS = {
+    "(while charging)": "charging",
+    "(while idle)": "idle",
+    "(persisted)": "persisted",
+    "(battery not low)": "battery_not_low",
+    "(storage not low)": "storage_not_low",
+}
+
+
+def _parse_job_network(network):
+    import re
+
+    if network == "null":
+        return "none"
+    if re.search(r"\bCELLULAR\b", network):
+        return "cellular"
+    if re.search(r"\bNOT_METERED\b", network):
+        return "unmetered"
+    if re.search(r"\bNOT_ROAMING\b", network):
+        return "not_roaming"
+    return "any"
+
+
+def _parse_jobs(text):
+    """
+    parse `termux-job-scheduler -p` output, lines of "Job <id>: <path>\t<description>".
+    network is None if not shown (android < 9), battery_not_low & storage_not_low
+    are None if they can not be shown (android < 8, assumed if nothing shows them).
+    """
+    import re
+
+    jobs = []
+    for line in text.splitlines():
+        m = re.match(r"(?:Pending )?Job (-?\d+): (.*)$", line.strip())
+        if m is None:
+            continue
+        path, tab, description = m.group(2).partition("\t")
+        if not tab:
+            path, _, description = m.group(2).partition(" (")
+            description = "(" + description if description else ""
+        job = {"job_id": int(m.group(1)), "script_path": path.strip()}
+        period = re.search(r"\(periodic: (\d+)ms\)", description)
+        job["period_ms"] = int(period.group(1)) if period else 0
+        network = re.search(r"\(network: (.*)\)", description)
+        job["network"] = _parse_job_network(network.group(1)) if network else None
+        for flag, key in _JOB_FLAGS.items():
+            job[key] = flag in description
+        jobs.append(job)
+    api_26 = ("network", "battery_not_low", "storage_not_low")
+    if not any(job[key] for job in jobs for key in api_26):
+        for job in jobs:
+            job["battery_not_low"] = job["storage_not_low"] = None
+    return jobs
+
+
+def job_scheduler_jobs():
+    """return pending jobs: [{job_id, script_path, period_ms, network, flags...}]"""
+    res, err = job_scheduler_list()
+    if err:
+        return None, err
+    return _parse_jobs(res), None
+
+
+def _job_differs(live, desired):
+    for key, value in desired.items():
+        if key not in live or live[key] is None:
+            continue
+        if key == "script_path":
+            value = os.path.realpath(value)
+        elif key == "period_ms" and value:
+            value = max(value, _JOB_MIN_PERIOD_MS)
+        elif key == "network" and value is None:
+            # termux-job-scheduler's default
+            value = "any"
+        if live[key] != value:
+            return True
+    return False
+
+
+def job_scheduler_reconcile(desired_jobs, dry_run=False):
+    """
+    make pending jobs match desired_jobs, a list of job_scheduler() kwargs with job_id.
+    only changed or missing jobs are scheduled (replacing the old job of the same id),
+    and only jobs not in desired_jobs are cancelled.
+    return (actions, error): [("schedule", kwargs) | ("cancel", job_id)],
+    actions are only listed if dry_run, stop at the first error.
+    changes termux does not show are not detected: trigger_content_uri,
+    network before android 9, battery_not_low & storage_not_low before android 8.
+    """
+    import inspect
+
+    signature = inspect.signature(job_scheduler)
+    desired_args = []
+    job_ids = set()
+    for job in desired_jobs:
+        if job.get("job_id") is None:
+            return None, ValueError(f"job_id is required: {job}")
+        if job["job_id"] in job_ids:
+            return None, ValueError(f"duplicate job_id: {job}")
+        job_ids.add(job["job_id"])
+        try:
+            desired = signature.bind(**job)
+        except TypeError as err:
+            return None, err
+        desired.apply_defaults()
+        desired_args.append(desired.arguments)
+    live, err = job_scheduler_jobs()
+    if err:
+        return None, err
+    live = {job["job_id"]: job for job in live}
+    actions = []
+    for job, desired in zip(desired_jobs, desired_args):
+        current = live.pop(job["job_id"], None)
+        if current is None or _job_differs(current, desired):
+            actions.append(("schedule", job))
+    actions.extend(("cancel", job_id) for job_id in live)
+    if dry_run:
+        return actions, None
+    for i, (action, arg) in enumerate(actions):
+        if action == "schedule":
+            _, err = job_scheduler(**arg)
+        else:
+            _, err = job_scheduler_cancel(arg)
+        if err:
+            return actions[:i], err
+    return actions, None
 
 
 def location(provider="gps", request="once"):
     """provider: gps/network/passive, request: once/last/updates"""
-    args = ["termux-location", "-p", provider, "-r", request]
-    if request == "updates":
-        return _run_updates(args)
-    return _run_json(args)
+    return _runners.location(provider, request)
 
 
 def media_player_info():
     """return {"Track": None} or {Status, Track, Current Position}"""
-    res, err = _run(["termux-media-player", "info"])
-    if err:
-        return None, err
-    if res.startswith("No track currently"):
-        return {"Track": None}, None
-    res = dict(
-        [line.split(": ", maxsplit=1) for line in res.split("\n") if ":" in line]
-    )
-    return res, None
+    return _runners.media_player_info()
 
 
 def media_player_play(file):
-    args = ["termux-media-player", "play", file]
-    return _run_startswith_error(args, "Now Playing")
+    return _runners.media_player_play(file)
 
 
 def media_player_pause():
-    return _run_startswith_map(
-        ["termux-media-player", "pause"],
-        {
-            "Paused playback": True,
-            "Playback already paused": None,
-            "No track to pause": False,
-        },
-    )
+    return _runners.media_player_pause()
 
 
 def media_player_resume():
-    return _run_startswith_map(
-        ["termux-media-player", "play"],
-        {
-            "Resumed playback": True,
-            "Already playing track": None,
-            "No previous track to resume": False,
-        },
-    )
+    return _runners.media_player_resume()
 
 
 def media_player_stop():
-    return _run_startswith_map(
-        ["termux-media-player", "stop"],
-        {
-            "Stopped playback": True,
-            "No track to stop": False,
-        },
-    )
+    return _runners.media_player_stop()
 
 
 def media_scan(files, recursive=False, verbose=False):
     """verbose makes no difference"""
-    # -v just prints all files out, including non-media files
-    args = _construct_args(
-        ["termux-media-scan"], {"-r": recursive, "-v": verbose}, {}, files
-    )
-    return _run_regex(args, "Finished scanning ([0-9]+) file", int)
+    return _runners.media_scan(files, recursive, verbose)
 
 
 def microphone_record(
@@ -395,30 +1149,17 @@ def microphone_record(
     default limit is 15min.
     default file is /sdcard/TermuxAudioRecording_yyyy-MM-dd_HH-mm-ss.<extension>
     """
-    args = _construct_args(
-        ["termux-microphone-record"],
-        {"-d": default},
-        {
-            "-f": file,
-            "-l": limit,
-            "-e": encoder,
-            "-b": bitrate,
-            "-r": sample_rate,
-            "-c": channel_count,
-        },
+    return _runners.microphone_record(
+        file, limit, encoder, bitrate, sample_rate, channel_count, default
     )
-    return _run_startswith_error(args, "Recording started")
 
 
 def microphone_record_info():
-    return _run_json(["termux-microphone-record", "-i"])
+    return _runners.microphone_record_info()
 
 
 def microphone_record_quit():
-    return _run_startswith_map(
-        ["termux-microphone-record", "-q"],
-        {"Recording finished": True, "No recording to stop": False},
-    )
+    return _runners.microphone_record_quit()
 
 
 def notification(
@@ -450,141 +1191,113 @@ def notification(
     media_previous=None,
 ):
     """refer to the official wiki: https://wiki.termux.com/wiki/Termux-notification"""
-    args = _construct_args(
-        ["termux-notification"],
-        {"--alert-once": alert_once, "--ongoing": pin, "--sound": sound},
-        {
-            "--action": action,
-            "--button1": button1,
-            "--button1-action": button1_action,
-            "--button2": button2,
-            "--button2-action": button2_action,
-            "--button3": button3,
-            "--button3-action": button3_action,
-            "--content": content,
-            "--group": group,
-            "--id": id,
-            "--image-path": image,
-            "--led-color": led_color,
-            "--led-off": led_off,
-            "--led-on": led_on,
-            "--on-delete": delete_action,
-            "--priority": priority,
-            "--title": title,
-            "--vibrate": _join_list(vibrate),
-            "--type": type,
-            "--media-next": media_next,
-            "--media-pause": media_pause,
-            "--media-play": media_play,
-            "--media-previous": media_previous,
-        },
+    return _runners.notification(
+        title,
+        content,
+        button1,
+        button2,
+        button3,
+        image,
+        sound,
+        vibrate,
+        led_color,
+        led_off,
+        led_on,
+        alert_once,
+        pin,
+        priority,
+        id,
+        group,
+        type,
+        action,
+        button1_action,
+        button2_action,
+        button3_action,
+        delete_action,
+        media_next,
+        media_pause,
+        media_play,
+        media_previous,
     )
-    return _run_error(args)
 
 
 def notification_remove(id):
-    return _run_error(["termux-notification-remove", id])
+    return _runners.notification_remove(id)
 
 
 def sensor(sensors=None, delay=None, times=None):
-    args = ["termux-sensor"]
-    if sensors is None:
-        args.append("-a")
-    else:
-        args.append("-s")
-        args.append(_join_list(sensors))
-    args = _construct_args(args, {}, {"-d": delay, "-n": times})
-    return _run_updates(args)
+    return _runners.sensor(sensors, delay, times)
 
 
 def sensor_cleanup():
     """clean up running sensor listeners"""
-    return _run_startswith_map(
-        ["termux-sensor", "-c"],
-        {
-            "Sensor cleanup successful": True,
-            "Sensor cleanup unnecessary": False,
-        },
-    )
+    return _runners.sensor_cleanup()
 
 
 def sensor_list():
-    return _run_json(["termux-sensor", "-l"])
+    return _runners.sensor_list()
 
 
 def sensor_once(sensors=None):
-    if sensors is None:
-        return _run_json(["termux-sensor", "-a", "-n", 1])
-    return _run_json(["termux-sensor", "-s", _join_list(sensors), "-n", 1])
+    return _runners.sensor_once(sensors)
 
 
 def share(file, action=None, content_type=None, default_receiver=False, title=None):
     """action: edit/send/view"""
-    args = _construct_args(
-        ["termux-share"],
-        {"-d": default_receiver},
-        {"-a": action, "-c": content_type, "-t": title},
-        [file],
-    )
-    return _run_error(args)
+    return _runners.share(file, action, content_type, default_receiver, title)
 
 
 def sms_list(
     offset=0, limit=10, show_date=False, show_number=False, message_type="inbox"
 ):
     """message_type: all|inbox|sent|draft|outbox"""
-    args = _construct_args(
-        ["termux-sms-list"],
-        {"-d": show_date, "-n": show_number},
-        {"-l": limit, "-o": offset, "-t": message_type},
-    )
-    return _run_json(args)
+    return _runners.sms_list(offset, limit, show_date, show_number, message_type)
 
 
 def sms_send(text, numbers, sim_slot=None):
     """not tested"""
-    args = _construct_args(
-        ["termux-sms-send"], {}, {"-n": _join_list(numbers), "-s": sim_slot}, [text]
-    )
-    return _run_error(args)
+    return _runners.sms_send(text, numbers, sim_slot)
 
 
 def storage_get(output_file):
-    return _run_error(["termux-storage-get", output_file])
+    return _runners.storage_get(output_file)
+
+
+def storage_get_bytes(buffer=None, max_size=32 << 20, timeout=120):
+    """
+    return (memoryview of the picked file, error), read from a fifo instead of a file.
+    buffer: writable buffer to read into, max_size is its length then.
+    timeout also covers the user picking the file.
+    """
+    return _run_capture(["termux-storage-get"], buffer, max_size, timeout)
 
 
 def telephony_call(number):
     """not tested"""
-    return _run_error(["termux-telephony-call", number])
+    return _runners.telephony_call(number)
 
 
 def telephony_cellinfo():
-    return _run_json(["termux-telephony-cellinfo"])
+    return _runners.telephony_cellinfo()
 
 
 def telephony_deviceinfo():
-    return _run_json(["termux-telephony-deviceinfo"])
+    return _runners.telephony_deviceinfo()
 
 
 def toast(
     text, position="middle", short=False, text_color="white", background_color="gray"
 ):
     """position: top/middle/bottom"""
-    args = _construct_args(
-        ["termux-toast"],
-        {"-s": short},
-        {"-g": position, "-c": text_color, "-b": background_color},
-        [text],
-    )
-    return _run_error(args)
+    return _runners.toast(text, position, short, text_color, background_color)
 
 
 def torch(on=True):
-    return _run_error(["termux-torch", "on" if on else "off"])
+    return _runners.torch(on)
 
 
 def tts_engines():
-    return _run_json(["termux-tts-engines"])
+    return _runners.tts_engines()
 
 
 def tts_speak(
@@ -599,21 +1312,9 @@ def tts_speak(
     timeout=None,
 ):
     """stream: ALARM, MUSIC, NOTIFICATION, RING, SYSTEM, VOICE_CALL"""
-    args = _construct_args(
-        ["termux-tts-speak"],
-        {},
-        {
-            "-e": engine,
-            "-l": language,
-            "-n": region,
-            "-v": variant,
-            "-p": pitch,
-            "-r": rate,
-            "-s": stream,
-        },
-        [text],
+    return _runners.tts_speak(
+        text, engine, language, region, variant, pitch, rate, stream, timeout
     )
-    return _run_error(args, timeout=timeout)
 
 
 def tts_speak_init(
@@ -626,20 +1327,9 @@ def tts_speak_init(
     stream=None,
 ):
     """return functions: speak(text), close()"""
-    args = _construct_args(
-        ["termux-tts-speak"],
-        {},
-        {
-            "-e": engine,
-            "-l": language,
-            "-n": region,
-            "-v": variant,
-            "-p": pitch,
-            "-r": rate,
-            "-s": stream,
-        },
+    args = _command("tts_speak_init")[0](
+        (engine, language, region, variant, pitch, rate, stream)
     )
-    args = [str(i) for i in args]
     popen = subprocess.Popen(args, bufsize=1, stdin=subprocess.PIPE, text=True)
     _all_popen.append(popen)
 
@@ -660,51 +1350,686 @@ def tts_speak_init(
 
 def usb(device, permission_dialog=False, execute_command=None):
     """not tested"""
-    args = _construct_args(
-        ["termux-usb"], {"-r": permission_dialog}, {"-e": execute_command}, [device]
-    )
-    return _run_error(args)
+    return _runners.usb(device, permission_dialog, execute_command)
 
 
 def usb_list():
-    return _run_json(["termux-usb", "-l"])
+    return _runners.usb_list()
 
 
 def vibrate(duration=None, force=False):
-    args = _construct_args(["termux-vibrate"], {"-f": force}, {"-d": duration})
-    return _run_error(args)
+    return _runners.vibrate(duration, force)
 
 
 def volume_get():
-    return _run_json(["termux-volume"])
+    return _runners.volume_get()
 
 
 def volume_set(stream, volume):
-    return _run_error(["termux-volume", stream, volume])
+    return _runners.volume_set(stream, volume)
 
 
 def wallpaper(file=None, url=None, lockscreen=False):
     """not tested"""
-    args = _construct_args(
-        ["termux-wallpaper"], {"-l": lockscreen}, {"-f": file, "-u": url}
-    )
-    return _run_error(args)
+    return _runners.wallpaper(file, url, lockscreen)
 
 
 def wifi_connectioninfo():
-    return _run_json(["termux-wifi-connectioninfo"])
+    return _runners.wifi_connectioninfo()
 
 
 def wifi_enable(enable=True):
     """not working on some devices"""
-    return _run_error(["termux-wifi-enable", "true" if enable else "false"])
+    return _runners.wifi_enable(enable)
 
 
 def wifi_scaninfo():
-    return _run_json(["termux-wifi-scaninfo"])
+    return _runners.wifi_scaninfo()
 
 
-if __name__ == "__main__":
+_LOCATION_FIELDS = ("latitude", "longitude", "altitude", "accuracy", "bearing", "speed")
+
+
+def _readings(result):
+    """yield (channel, values) from a sensor() or location() result"""
+    if "latitude" in result:
+        values = [result.get(k) for k in _LOCATION_FIELDS]
+        yield "location", [float("nan") if v is None else v for v in values]
+        return
+    for name, data in result.items():
+        yield name, data["values"]
+
+
+class _Readings:
+    """add() & record() of sensor() / location() results by append() of a subclass"""
+
+    def add(self, result, timestamp=None):
+        if timestamp is None:
+            timestamp = self.clock()
+        for channel, values in _readings(result):
+            self.append(channel, values, timestamp)
+
+    def record(self, updates):
+        """
+        yield (result, error) from updates, adding every result.
+        a result that can not be added (e.g. its value count changed) is yielded as error.
+        """
+        for res, err in updates:
+            if res is not None:
+                try:
+                    self.add(res)
+                except ValueError as add_err:
+                    res, err = None, add_err
+            yield res, err
+
+
+class RingBuffer:
+    """
+    fixed-capacity buffer of (timestamp, row of floats), oldest rows are overwritten.
+    timestamps never decrease (an earlier one is clamped to the latest),
+    so lookups are binary searches.
+    """
+
+    def __init__(self, width, capacity=1024, max_age=None):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.width = width
+        self.capacity = capacity
+        self.max_age = max_age
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity * width))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _time(self, i):
+        return self._times[(self._start + i) % self.capacity]
+
+    def _row(self, i):
+        j = (self._start + i) % self.capacity * self.width
+        return tuple(self._values[j : j + self.width])
+
+    def _bisect(self, timestamp, right=False):
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = self._time(mid)
+            if t < timestamp or (right and t == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def append(self, timestamp, values):
+        if len(values) != self.width:
+            raise ValueError(f"expected {self.width} values, got {len(values)}")
+        if self._size:
+            timestamp = max(timestamp, self._time(self._size - 1))
+        if self._size == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+            self._size -= 1
+        i = (self._start + self._size) % self.capacity
+        self._times[i] = timestamp
+        self._values[i * self.width : (i + 1) * self.width] = array("d", values)
+        self._size += 1
+        if self.max_age is not None:
+            self.expire(timestamp - self.max_age)
+
+    def expire(self, before):
+        """drop rows older than before"""
+        n = self._bisect(before)
+        self._start = (self._start + n) % self.capacity
+        self._size -= n
+
+    def window(self, start=None, end=None):
+        """return (timestamps, rows) where start <= timestamp <= end"""
+        lo = 0 if start is None else self._bisect(start)
+        hi = self._size if end is None else self._bisect(end, right=True)
+        indices = range(lo, hi)
+        return [self._time(i) for i in indices], [self._row(i) for i in indices]
+
+    def at(self, timestamp, interpolate=True):
+        """row at timestamp, linearly interpolated or nearest; None if empty"""
+        if not self._size:
+            return None
+        i = self._bisect(timestamp)
+        if i == self._size:
+            return self._row(i - 1)
+        t1 = self._time(i)
+        if i == 0 or t1 == timestamp:
+            return self._row(i)
+        t0 = self._time(i - 1)
+        if not interpolate:
+            return self._row(i - 1 if timestamp - t0 <= t1 - timestamp else i)
+        ratio = (timestamp - t0) / (t1 - t0)
+        return tuple(
+            a + (b - a) * ratio for a, b in zip(self._row(i - 1), self._row(i))
+        )
+
+
+class History(_Readings):
+    """
+    bounded history of sensor() / location(request="updates") results,
+    one RingBuffer per sensor name ("location" for location).
+    capacity: max rows per channel, max_age: max seconds kept (optional).
+    location rows are latitude, longitude, altitude, accuracy, bearing, speed.
+    """
+
+    def __init__(self, capacity=1024, max_age=None, clock=time.time):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.max_age = max_age
+        self.clock = clock
+        self.buffers: dict[str, RingBuffer] = {}
+
+    def append(self, channel, values, timestamp=None):
+        if timestamp is None:
+            timestamp = self.clock()
+        buffer = self.buffers.get(channel)
+        if buffer is None:
+            buffer = RingBuffer(len(values), self.capacity, self.max_age)
+            self.buffers[channel] = buffer
+        buffer.append(timestamp, values)
+
+    def window(self, channel, start=None, end=None):
+        """return (timestamps, rows) of channel where start <= timestamp <= end"""
+        if channel not in self.buffers:
+            return [], []
+        return self.buffers[channel].window(start, end)
+
+    def last(self, channel, seconds):
+        """return (timestamps, rows) of channel in the last seconds"""
+        return self.window(channel, self.clock() - seconds)
+
+    def at(self, channel, timestamp, interpolate=True):
+        """row of channel at timestamp, linearly interpolated or nearest"""
+        if channel not in self.buffers:
+            return None
+        return self.buffers[channel].at(timestamp, interpolate)
+
+
+_FEATURES = ("mean", "var", "rms", "min", "max")
+_numpy_module = False
+
+
+def _numpy():
+    """numpy if installed, imported on first use"""
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy as _numpy_module
+        except ImportError:
+            _numpy_module = None
+    return _numpy_module
+
+
+class _Window:
+    """
+    sliding window of the last size rows, stats updated in O(1) per value.
+    sums are of values minus a shift (a recent mean), so the variance keeps its
+    precision when values are large relative to their spread. the sums are
+    recomputed with a new shift once per size rows, amortized O(1).
+    """
+
+    def __init__(self, width, size):
+        self.size = size
+        self.rows = deque()
+        self.count = 0
+        self.shifts = [0.0] * width
+        self.sums = [0.0] * width
+        self.squares = [0.0] * width
+        # monotonic deques of (row number, value), front is the min / max
+        self.mins = [deque() for _ in range(width)]
+        self.maxs = [deque() for _ in range(width)]
+
+    def push(self, values):
+        if len(self.rows) == self.size:
+            for k, v in enumerate(self.rows.popleft()):
+                v -= self.shifts[k]
+                self.sums[k] -= v
+                self.squares[k] -= v * v
+        self.rows.append(values)
+        oldest = self.count - self.size + 1
+        for k, v in enumerate(values):
+            d = v - self.shifts[k]
+            self.sums[k] += d
+            self.squares[k] += d * d
+            mins, maxs = self.mins[k], self.maxs[k]
+            while mins and mins[-1][1] >= v:
+                mins.pop()
+            while maxs and maxs[-1][1] <= v:
+                maxs.pop()
+            mins.append((self.count, v))
+            maxs.append((self.count, v))
+            if mins[0][0] < oldest:
+                mins.popleft()
+            if maxs[0][0] < oldest:
+                maxs.popleft()
+        self.count += 1
+        if self.count == 1 or self.count % self.size == 0:
+            self._reshift()
+
+    def _reshift(self):
+        """recompute the sums around the current mean, dropping rounding drift"""
+        n = len(self.rows)
+        for k, column in enumerate(zip(*self.rows)):
+            shift = self.shifts[k] + self.sums[k] / n
+            if not math.isfinite(shift):
+                # nan / inf only stay in the sums while such a value is in the window
+                shift = 0.0
+            self.shifts[k] = shift
+            self.sums[k] = math.fsum(v - shift for v in column)
+            self.squares[k] = math.fsum((v - shift) ** 2 for v in column)
+
+    def features(self, names):
+        n = len(self.rows)
+        offsets = [s / n for s in self.sums]
+        means = [shift + d for shift, d in zip(self.shifts, offsets)]
+        variances = [max(q / n - d * d, 0.0) for q, d in zip(self.squares, offsets)]
+        res = {}
+        if "mean" in names:
+            res["mean"] = means
+        if "var" in names:
+            res["var"] = variances
+        if "rms" in names:
+            res["rms"] = [math.sqrt(v + m * m) for v, m in zip(variances, means)]
+        if "min" in names:
+            res["min"] = [d[0][1] for d in self.mins]
+        if "max" in names:
+            res["max"] = [d[0][1] for d in self.maxs]
+        if "fft" in names:
+            res.update(_fft_features(_numpy().array(self.rows, dtype=float)))
+        return res
+
+
+def _fft_features(block):
+    """per column: index and magnitude of the strongest non-DC frequency bin"""
+    numpy = _numpy()
+    spectrum = numpy.abs(numpy.fft.rfft(block - block.mean(axis=0), axis=0))
+    spectrum[0] = 0
+    peak = spectrum.argmax(axis=0)
+    return {
+        "fft_peak": peak.tolist(),
+        "fft_magnitude": spectrum[peak, numpy.arange(block.shape[1])].tolist(),
+    }
+
+
+def _block_features(block, names):
+    """features of a whole window at once, vectorized by numpy"""
+    numpy = _numpy()
+    res = {}
+    if "mean" in names:
+        res["mean"] = block.mean(axis=0).tolist()
+    if "var" in names:
+        res["var"] = block.var(axis=0).tolist()
+    if "rms" in names:
+        res["rms"] = numpy.sqrt((block * block).mean(axis=0)).tolist()
+    if "min" in names:
+        res["min"] = block.min(axis=0).tolist()
+    if "max" in names:
+        res["max"] = block.max(axis=0).tolist()
+    if "fft" in names:
+        res.update(_fft_features(block))
+    return res
+
+
+def sensor_features(updates, size, step=None, features=_FEATURES):
+    """
+    yield ({sensor: {feature: [value per axis]}}, error) once per window
+    of size readings, instead of the raw sensor() readings.
+    a new window starts every step readings, step defaults to size (tumbling windows).
+    features: mean, var, rms, min, max,
+    fft (fft_peak bin & fft_magnitude, requires numpy)
+    """
+    features = set(features)
+    unknown = features - set(_FEATURES) - {"fft"}
+    if unknown:
+        raise ValueError(f"unknown features: {unknown}")
+    numpy = _numpy()
+    if "fft" in features and numpy is None:
+        raise ValueError("fft feature requires numpy")
+    if step is None:
+        step = size
+    if size < 1 or step < 1:
+        raise ValueError(f"size & step must be at least 1, got {size} & {step}")
+    if numpy is not None and step == size:
+        return _sensor_blocks(updates, size, features)
+    return _sensor_windows(updates, size, step, features)
+
+
+def _sensor_windows(updates, size, step, features):
+    windows: dict[str, _Window] = {}
+    for res, err in updates:
+        if err:
+            yield None, err
+            continue
+        for name, values in _readings(res):
+            window = windows.get(name)
+            if window is None:
+                window = windows[name] = _Window(len(values), size)
+            window.push(values)
+            if window.count >= size and (window.count - size) % step == 0:
+                yield {name: window.features(features)}, None
+
+
+def _sensor_blocks(updates, size, features):
+    numpy = _numpy()
+    blocks: dict[str, list] = {}
+    for res, err in updates:
+        if err:
+            yield None, err
+            continue
+        for name, values in _readings(res):
+            block = blocks.setdefault(name, [])
+            block.append(values)
+            if len(block) == size:
+                block_array = numpy.array(block, dtype=float)
+                yield {name: _block_features(block_array, features)}, None
+                block.clear()
+
+
+_RECORDING_MAGIC = b"TXAPIREC"
+_RECORDING_END = b"TXAPIIDX"
+# magic, name length, width, dtype, row count, first & last timestamp
+_CHUNK = struct.Struct("<4sHHc3xIdd")
+# the index: a channel table of name length, width, dtype & name,
+# then per chunk its offset, first & last timestamp, channel number
+_INDEX_CHANNEL = struct.Struct("<HHc3x")
+_INDEX_ENTRY = struct.Struct("<QddI4x")
+# index offset, channel count, chunk count
+_TRAILER = struct.Struct("<QII8s")
+
+
+def _pad8(n):
+    return -n % 8
+
+
+def _chunk_layout(buf, offset):
+    """return (name, width, dtype, count, times offset, values offset, end offset)"""
+    magic, name_len, width, dtype, count, _, _ = _CHUNK.unpack_from(buf, offset)
+    if magic != b"CHNK":
+        raise ValueError(f"no chunk at offset {offset}")
+    name_start = offset + _CHUNK.size
+    name = bytes(buf[name_start : name_start + name_len]).decode()
+    dtype = dtype.decode()
+    times = name_start + name_len + _pad8(name_len)
+    values = times + 8 * count
+    values_len = array(dtype).itemsize * count * width
+    return (
+        name,
+        width,
+        dtype,
+        count,
+        times,
+        values,
+        values + values_len + _pad8(values_len),
+    )
+
+
+def _write_index(file, channels, entries):
+    """write the channel table [(name, width, dtype)], chunk entries & trailer"""
+    index = file.tell()
+    for name, width, dtype in channels:
+        name = name.encode()
+        file.write(_INDEX_CHANNEL.pack(len(name), width, dtype.encode()))
+        file.write(name + bytes(_pad8(len(name))))
+    for entry in entries:
+        file.write(_INDEX_ENTRY.pack(*entry))
+    file.write(_TRAILER.pack(index, len(channels), len(entries), _RECORDING_END))
+
+
+def _read_index(buf):
+    """
+    return ([(name, width, dtype)], [(offset, first, last timestamp, channel number)],
+    offset of the index) from the trailer, or None
+    """
+    if len(buf) < len(_RECORDING_MAGIC) + _TRAILER.size:
+        return None
+    trailer = len(buf) - _TRAILER.size
+    index, channel_count, count, end = _TRAILER.unpack_from(buf, trailer)
+    if end != _RECORDING_END or not len(_RECORDING_MAGIC) <= index <= trailer:
+        return None
+    channels = []
+    offset = index
+    try:
+        for _ in range(channel_count):
+            name_len, width, dtype = _INDEX_CHANNEL.unpack_from(buf, offset)
+            offset += _INDEX_CHANNEL.size
+            name = bytes(buf[offset : offset + name_len]).decode()
+            channels.append((name, width, dtype.decode()))
+            offset += name_len + _pad8(name_len)
+    except (struct.error, UnicodeDecodeError):
+        return None
+    if offset + count * _INDEX_ENTRY.size != trailer:
+        return None
+    entries = [
+        _INDEX_ENTRY.unpack_from(buf, offset + i * _INDEX_ENTRY.size)
+        for i in range(count)
+    ]
+    if any(entry[3] >= len(channels) for entry in entries):
+        return None
+    return channels, entries, index
+
+
+def _scan_chunks(buf):
+    """like _read_index() by the chunk headers, offset is the end of the last chunk"""
+    channels, numbers, entries = [], {}, []
+    offset = len(_RECORDING_MAGIC)
+    while offset + _CHUNK.size <= len(buf):
+        try:
+            layout = _chunk_layout(buf, offset)
+        except (ValueError, UnicodeDecodeError):
+            break
+        if layout[-1] > len(buf):
+            break
+        channel = layout[:3]
+        if channel not in numbers:
+            numbers[channel] = len(channels)
+            channels.append(channel)
+        first, last = _CHUNK.unpack_from(buf, offset)[-2:]
+        entries.append((offset, first, last, numbers[channel]))
+        offset = layout[-1]
+    return channels, entries, offset
+
+
+class Recorder(_Readings):
+    """
+    append sensor() / location() results to a chunked binary file, read it by Recording.
+    rows are buffered per channel and written as one chunk every chunk_size rows,
+    the chunk index is written on close(). an existing file is appended to,
+    keeping the width & dtype of its channels.
+    dtype: "f" (float32) or "d" (float64) for sensor values, location is always "d".
+    """
+
+    def __init__(self, path, chunk_size=1024, dtype="f", clock=time.time):
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.clock = clock
+        # [(name, width, dtype)] & {name: channel number} of the index
+        self._channels = []
+        self._numbers: dict[str, int] = {}
+        self._index = []
+        self._buffers: dict[str, tuple[int, array, array]] = {}
+        self._last: dict[str, float] = {}
+        if os.path.exists(path):
+            self._recover(path)
+        self._file = open(path, "ab", buffering=1 << 16)
+        if self._file.tell() == 0:
+            # so that Recording can open the file while it is recorded
+            self._file.write(_RECORDING_MAGIC)
+            self._file.flush()
+
+    def _recover(self, path):
+        """
+        load the index & last timestamp per channel of an existing file,
+        then cut the index off to append chunks.
+        """
+        if not os.path.getsize(path):
+            return
+        with open(path, "r+b") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                if buf[: len(_RECORDING_MAGIC)] != _RECORDING_MAGIC:
+                    raise ValueError(f"{path} is not a recording")
+                channels, index, end = _read_index(buf) or _scan_chunks(buf)
+            for _, _, last, number in index:
+                channel = channels[number][0]
+                self._last[channel] = max(last, self._last.get(channel, last))
+            for number, (name, _, _) in enumerate(channels):
+                self._numbers.setdefault(name, number)
+            self._channels = channels
+            self._index = index
+            file.truncate(end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, channel, values, timestamp=None):
+        if timestamp is None:
+            timestamp = self.clock()
+        buffer = self._buffers.get(channel)
+        if buffer is None:
+            if channel not in self._numbers:
+                dtype = "d" if channel == "location" else self.dtype
+                self._numbers[channel] = len(self._channels)
+                self._channels.append((channel, len(values), dtype))
+            _, width, dtype = self._channels[self._numbers[channel]]
+            buffer = (width, array("d"), array(dtype))
+            self._buffers[channel] = buffer
+        width, times, rows = buffer
+        if len(values) != width:
+            raise ValueError(f"expected {width} values, got {len(values)}")
+        timestamp = max(timestamp, self._last.get(channel, timestamp))
+        self._last[channel] = timestamp
+        times.append(timestamp)
+        rows.extend(values)
+        if len(times) >= self.chunk_size:
+            self._write_chunk(channel)
+
+    def _write_chunk(self, channel):
+        width, times, rows = self._buffers[channel]
+        if not times:
+            return
+        name = channel.encode()
+        values = rows.tobytes()
+        entry = (self._file.tell(), times[0], times[-1], self._numbers[channel])
+        self._index.append(entry)
+        self._file.write(
+            _CHUNK.pack(
+                b"CHNK",
+                len(name),
+                width,
+                rows.typecode.encode(),
+                len(times),
+                times[0],
+                times[-1],
+            )
+        )
+        self._file.write(name + bytes(_pad8(len(name))))
+        self._file.write(times.tobytes())
+        self._file.write(values + bytes(_pad8(len(values))))
+        del times[:]
+        del rows[:]
+
+    def flush(self):
+        """write all buffered rows as chunks"""
+        for channel in self._buffers:
+            self._write_chunk(channel)
+        self._file.flush()
+
+    def close(self):
+        """flush, then write the chunk index"""
+        if self._file.closed:
+            return
+        self.flush()
+        _write_index(self._file, self._channels, self._index)
+        self._file.close()
+
+
+class Recording:
+    """
+    memory-mapped reader of a Recorder file.
+    chunks are located by the index (or a scan of chunk headers if it was not closed),
+    a chunk header is only read when chunks() reaches it,
+    rows are only read for the requested time range.
+    channels: {name: (width, dtype)}
+    """
+
+    def __init__(self, path):
+        if not os.path.getsize(path):
+            raise ValueError(f"{path} is not a recording")
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if self._view[: len(_RECORDING_MAGIC)] != _RECORDING_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a recording")
+        channels, index, _ = _read_index(self._view) or _scan_chunks(self._view)
+        self.channels: dict[str, tuple[int, str]] = {}
+        for name, width, dtype in channels:
+            self.channels.setdefault(name, (width, dtype))
+        # {name: [(first timestamp, last timestamp, offset)]}, ordered by first
+        self._chunks: dict[str, list] = {}
+        for offset, first, last, number in index:
+            name = channels[number][0]
+            self._chunks.setdefault(name, []).append((first, last, offset))
+        # {name: [max last timestamp of chunks up to i]}, sorted for bisect
+        self._lasts: dict[str, list] = {}
+        for name, chunks in self._chunks.items():
+            chunks.sort(key=lambda chunk: chunk[0])
+            lasts = self._lasts[name] = []
+            for _, last, _ in chunks:
+                lasts.append(max(last, lasts[-1]) if lasts else last)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def chunks(self, channel, start=None, end=None):
+        """
+        yield (timestamps, values) memoryviews without copying,
+        where start <= timestamp <= end. values are flat rows of the channel width.
+        """
+        chunks = self._chunks.get(channel, [])
+        i = 0 if start is None else bisect_left(self._lasts.get(channel, []), start)
+        for first, _, offset in chunks[i:]:
+            if end is not None and first > end:
+                break
+            _, width, dtype, count, times, values, _ = _chunk_layout(self._view, offset)
+            times = self._view[times : times + 8 * count].cast("d")
+            lo = 0 if start is None else bisect_left(times, start)
+            hi = count if end is None else bisect_right(times, end)
+            row_size = array(dtype).itemsize * width
+            values = self._view[values + lo * row_size : values + hi * row_size]
+            yield times[lo:hi], values.cast(dtype)
+
+    def read(self, channel, start=None, end=None):
+        """return (timestamps, values) arrays, values are flat rows of channel width"""
+        width_dtype = self.channels.get(channel)
+        times, values = array("d"), array(width_dtype[1] if width_dtype else "d")
+        for chunk_times, chunk_values in self.chunks(channel, start, end):
+            times.frombytes(chunk_times.cast("B"))
+            values.frombytes(chunk_values.cast("B"))
+            chunk_times.release()
+            chunk_values.release()
+        return times, values
+
+    def close(self):
+        """memoryviews from chunks() must be released before closing"""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def _test():
+    """interactive test of all commands: python -m termux_api --test"""
 
     def run_tests(tests, wait_enter=True):
         for test in tests:
@@ -815,3 +2140,133 @@ if __name__ == "__main__":
     run_tests(tests)
     test_sensor()
     test_tts_speak()
+
+
+# functions besides the command specs that can be called from the command line
+_CLI_FUNCTIONS = ("camera_photo_bytes", "storage_get_bytes", "job_scheduler_jobs")
+
+
+def _cli_usage():
+    names = sorted(spec.name for spec in _SPECS if spec.parse is not None)
+    names += _CLI_FUNCTIONS
+    return (
+        "usage: python -m termux_api <command> [args] [--name value] [--flag]\n"
+        "       python -m termux_api <command> --help\n"
+        "       python -m termux_api --test  (interactive test of all commands)\n"
+        "commands: " + " ".join(names)
+    )
+
+
+def _cli_args(func, argv, spec=None):
+    """parse argv by the parameters of func: args, --name value, --name=value, --flag"""
+    code = func.__code__
+    names = code.co_varnames[: code.co_argcount]
+    defaults = func.__defaults__ or ()
+    defaults = dict(zip(names[len(names) - len(defaults) :], defaults))
+    steps = _parse_template(spec.template)[1] if spec else []
+    lists = {
+        name
+        for kind, _, name, converter in steps
+        if kind == _EXTEND or converter in (_join_list, _sensor_args)
+    }
+
+    def convert(name, value):
+        default = defaults.get(name)
+        if name in lists:
+            return value.split(",")
+        if isinstance(default, bool):
+            return value.lower() not in ("false", "off", "no", "0")
+        if isinstance(default, (int, float)):
+            return type(default)(value)
+        return value
+
+    args, kwargs = [], {}
+    argv = iter(argv)
+    for arg in argv:
+        if not arg.startswith("--"):
+            name = names[len(args)] if len(args) < len(names) else None
+            args.append(convert(name, arg))
+            continue
+        name, eq, value = arg[2:].partition("=")
+        name = name.replace("-", "_")
+        if not eq:
+            value = "true" if isinstance(defaults.get(name), bool) else next(argv, "")
+        kwargs[name] = convert(name, value)
+    return args, kwargs
+
+
+def _cli_print(res):
+    if res is None:
+        return
+    if isinstance(res, (bytes, bytearray, memoryview)):
+        sys.stdout.buffer.write(res)
+    elif isinstance(res, str):
+        sys.stdout.write(res)
+    else:
+        import json
+
+        print(json.dumps(res, indent=2, ensure_ascii=False))
+    sys.stdout.flush()
+
+
+def _main(argv):
+    """
+    python -m termux_api <command> [args]: only the called command is compiled.
+    return exit status: 1 if the command failed, 2 if the arguments are wrong.
+    """
+    if not argv:
+        print(_cli_usage(), file=sys.stderr)
+        return 2
+    if argv[0] in ("-h", "--help"):
+        print(_cli_usage())
+        return 0
+    if argv[0] == "--test":
+        _test()
+        return 0
+    name = argv[0].replace("-", "_")
+    name = name[len("termux_") :] if name.startswith("termux_") else name
+    spec = _SPECS_BY_NAME.get(name)
+    if spec is not None and spec.parse is not None:
+        func = globals()[name]
+    elif name in _CLI_FUNCTIONS:
+        func, spec = globals()[name], None
+    else:
+        print(f"unknown command: {argv[0]}\n{_cli_usage()}", file=sys.stderr)
+        return 2
+    if "-h" in argv[1:] or "--help" in argv[1:]:
+        import inspect
+
+        print(f"{name}{inspect.signature(func)}")
+        if func.__doc__:
+            print(inspect.cleandoc(func.__doc__))
+        return 0
+    try:
+        args, kwargs = _cli_args(func, argv[1:], spec)
+        if spec is not None:
+            # check the choices before running, the function returns them as error
+            import inspect
+
+            values = inspect.signature(func).bind(*args, **kwargs)
+            values.apply_defaults()
+            _command(name)[0](values.args)
+    except (TypeError, ValueError) as err:
+        print(err, file=sys.stderr)
+        return 2
+    status = 0
+    try:
+        results = func(*args, **kwargs)
+        for res, err in [results] if isinstance(results, tuple) else results:
+            if err:
+                print(err, file=sys.stderr)
+                status = 1
+            else:
+                _cli_print(res)
+    except OSError as err:
+        # e.g. termux-api is not installed
+        print(err, file=sys.stderr)
+        return 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,415 @@
+"""
+argv of every command, with its default arguments & with every option set.
+
+run: python -m unittest discover tests
+"""
+
+import inspect
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import termux_api  # noqa: E402
+
+# (function, kwargs, argv), argv is split on spaces if it is a string
+CASES = [
+    ("battery_status", {}, "termux-battery-status"),
+    ("brightness", {"brightness": "brightness"}, "termux-brightness brightness"),
+    ("call_log", {}, "termux-call-log -o 0 -l 10"),
+    ("call_log", {"offset": 7, "limit": 17}, "termux-call-log -o 7 -l 17"),
+    ("camera_info", {}, "termux-camera-info"),
+    (
+        "camera_photo",
+        {"output_file": "output-file"},
+        "termux-camera-photo -c 0 output-file",
+    ),
+    (
+        "camera_photo",
+        {"output_file": "output-file", "camera_id": 7},
+        "termux-camera-photo -c 7 output-file",
+    ),
+    ("clipboard_get", {}, "termux-clipboard-get"),
+    ("clipboard_set", {"text": "text"}, "termux-clipboard-set text"),
+    ("contact_list", {}, "termux-contact-list"),
+    ("dialog_list", {}, "termux-dialog -l"),
+    ("dialog_confirm", {}, "termux-dialog confirm"),
+    (
+        "dialog_confirm",
+        {"title": "title", "hint": "hint"},
+        "termux-dialog confirm -t title -i hint",
+    ),
+    ("dialog_checkbox", {}, ["termux-dialog", "checkbox", "-v", ""]),
+    (
+        "dialog_checkbox",
+        {"title": "title", "values": ["a", "b"]},
+        "termux-dialog checkbox -t title -v a,b",
+    ),
+    ("dialog_counter", {}, "termux-dialog counter"),
+    (
+        "dialog_counter",
+        {"title": "title", "range": [1, 10, 5]},
+        "termux-dialog counter -t title -r 1,10,5",
+    ),
+    ("dialog_date", {}, "termux-dialog date"),
+    (
+        "dialog_date",
+        {"title": "title", "date_format": "date-format"},
+        "termux-dialog date -t title -d date-format",
+    ),
+    ("dialog_radio", {}, ["termux-dialog", "radio", "-v", ""]),
+    (
+        "dialog_radio",
+        {"title": "title", "values": ["a", "b"]},
+        "termux-dialog radio -t title -v a,b",
+    ),
+    ("dialog_sheet", {}, ["termux-dialog", "sheet", "-v", ""]),
+    (
+        "dialog_sheet",
+        {"title": "title", "values": ["a", "b"]},
+        "termux-dialog sheet -t title -v a,b",
+    ),
+    ("dialog_spinner", {}, ["termux-dialog", "spinner", "-v", ""]),
+    (
+        "dialog_spinner",
+        {"title": "title", "values": ["a", "b"]},
+        "termux-dialog spinner -t title -v a,b",
+    ),
+    ("dialog_speech", {}, "termux-dialog speech"),
+    (
+        "dialog_speech",
+        {"title": "title", "hint": "hint"},
+        "termux-dialog speech -t title -i hint",
+    ),
+    ("dialog_text", {}, "termux-dialog text"),
+    (
+        "dialog_text",
+        {
+            "title": "title",
+            "hint": "hint",
+            "multi_line": True,
+            "number": True,
+            "password": True,
+        },
+        "termux-dialog text -m -n -p -t title -i hint",
+    ),
+    ("dialog_time", {}, "termux-dialog time"),
+    ("dialog_time", {"title": "title"}, "termux-dialog time -t title"),
+    ("download", {"url": "url"}, "termux-download url"),
+    (
+        "download",
+        {"url": "url", "path": "path", "title": "title", "description": "description"},
+        "termux-download -p path -t title -d description url",
+    ),
+    ("fingerprint", {}, "termux-fingerprint"),
+    ("infrared_frequencies", {}, "termux-infrared-frequencies"),
+    (
+        "infrared_transmit",
+        {"frequency": "frequency", "pattern": ["a", "b"]},
+        "termux-infrared-transmit -f frequency a,b",
+    ),
+    ("job_scheduler_list", {}, "termux-job-scheduler -p"),
+    ("job_scheduler_cancel", {}, "termux-job-scheduler --cancel"),
+    (
+        "job_scheduler_cancel",
+        {"job_id": "job-id"},
+        "termux-job-scheduler --cancel job-id",
+    ),
+    ("job_scheduler_cancel_all", {}, "termux-job-scheduler --cancel-all"),
+    (
+        "job_scheduler",
+        {"script_path": "script-path"},
+        "termux-job-scheduler -s script-path --period-ms 0 --network any --battery-not-low true --storage-not-low false --charging false --persisted false --trigger-content-flag 1",
+    ),
+    (
+        "job_scheduler",
+        {
+            "script_path": "script-path",
+            "job_id": "job-id",
+            "period_ms": 7,
+            "network": "none",
+            "battery_not_low": False,
+            "storage_not_low": True,
+            "charging": True,
+            "persisted": True,
+            "trigger_content_uri": "trigger-content-uri",
+            "trigger_content_flag": 8,
+        },
+        "termux-job-scheduler -s script-path --job-id job-id --period-ms 7 --network none --battery-not-low false --storage-not-low true --charging true --persisted true --trigger-content-uri trigger-content-uri --trigger-content-flag 8",
+    ),
+    ("location", {}, "termux-location -p gps -r once"),
+    (
+        "location",
+        {"provider": "passive", "request": "updates"},
+        "termux-location -p passive -r updates",
+    ),
+    ("media_player_info", {}, "termux-media-player info"),
+    ("media_player_play", {"file": "file"}, "termux-media-player play file"),
+    ("media_player_pause", {}, "termux-media-player pause"),
+    ("media_player_resume", {}, "termux-media-player play"),
+    ("media_player_stop", {}, "termux-media-player stop"),
+    ("media_scan", {"files": ["a", "b"]}, "termux-media-scan a b"),
+    (
+        "media_scan",
+        {"files": ["a", "b"], "recursive": True, "verbose": True},
+        "termux-media-scan -r -v a b",
+    ),
+    ("microphone_record", {}, "termux-microphone-record"),
+    (
+        "microphone_record",
+        {
+            "file": "file",
+            "limit": "limit",
+            "encoder": "encoder",
+            "bitrate": "bitrate",
+            "sample_rate": "sample-rate",
+            "channel_count": "channel-count",
+            "default": True,
+        },
+        "termux-microphone-record -d -f file -l limit -e encoder -b bitrate -r sample-rate -c channel-count",
+    ),
+    ("microphone_record_info", {}, "termux-microphone-record -i"),
+    ("microphone_record_quit", {}, "termux-microphone-record -q"),
+    ("notification", {}, "termux-notification"),
+    (
+        "notification",
+        {
+            "title": "title",
+            "content": "content",
+            "button1": "button1",
+            "button2": "button2",
+            "button3": "button3",
+            "image": "image",
+            "sound": True,
+            "vibrate": ["a", "b"],
+            "led_color": "led-color",
+            "led_off": "led-off",
+            "led_on": "led-on",
+            "alert_once": True,
+            "pin": True,
+            "priority": "priority",
+            "id": "id",
+            "group": "group",
+            "type": "type",
+            "action": "action",
+            "button1_action": "button1-action",
+            "button2_action": "button2-action",
+            "button3_action": "button3-action",
+            "delete_action": "delete-action",
+            "media_next": "media-next",
+            "media_pause": "media-pause",
+            "media_play": "media-play",
+            "media_previous": "media-previous",
+        },
+        "termux-notification --alert-once --ongoing --sound --action action --button1 button1 --button1-action button1-action --button2 button2 --button2-action button2-action --button3 button3 --button3-action button3-action --content content --group group --id id --image-path image --led-color led-color --led-off led-off --led-on led-on --on-delete delete-action --priority priority --title title --type type --media-next media-next --media-pause media-pause --media-play media-play --media-previous media-previous --vibrate a,b",
+    ),
+    ("notification_remove", {"id": "id"}, "termux-notification-remove id"),
+    ("sensor", {}, "termux-sensor -a"),
+    (
+        "sensor",
+        {"sensors": ["a", "b"], "delay": "delay", "times": "times"},
+        "termux-sensor -d delay -n times -s a,b",
+    ),
+    ("sensor_cleanup", {}, "termux-sensor -c"),
+    ("sensor_list", {}, "termux-sensor -l"),
+    ("sensor_once", {}, "termux-sensor -n 1 -a"),
+    ("sensor_once", {"sensors": ["a", "b"]}, "termux-sensor -n 1 -s a,b"),
+    ("share", {"file": "file"}, "termux-share file"),
+    (
+        "share",
+        {
+            "file": "file",
+            "action": "view",
+            "content_type": "content-type",
+            "default_receiver": True,
+            "title": "title",
+        },
+        "termux-share -d -a view -c content-type -t title file",
+    ),
+    ("sms_list", {}, "termux-sms-list -l 10 -o 0 -t inbox"),
+    (
+        "sms_list",
+        {
+            "offset": 7,
+            "limit": 17,
+            "show_date": True,
+            "show_number": True,
+            "message_type": "outbox",
+        },
+        "termux-sms-list -d -n -l 17 -o 7 -t outbox",
+    ),
+    (
+        "sms_send",
+        {"text": "text", "numbers": ["a", "b"]},
+        "termux-sms-send -n a,b text",
+    ),
+    (
+        "sms_send",
+        {"text": "text", "numbers": ["a", "b"], "sim_slot": "sim-slot"},
+        "termux-sms-send -s sim-slot -n a,b text",
+    ),
+    ("storage_get", {"output_file": "output-file"}, "termux-storage-get output-file"),
+    ("telephony_call", {"number": "number"}, "termux-telephony-call number"),
+    ("telephony_cellinfo", {}, "termux-telephony-cellinfo"),
+    ("telephony_deviceinfo", {}, "termux-telephony-deviceinfo"),
+    ("toast", {"text": "text"}, "termux-toast -g middle -c white -b gray text"),
+    (
+        "toast",
+        {
+            "text": "text",
+            "position": "bottom",
+            "short": True,
+            "text_color": "text-color",
+            "background_color": "background-color",
+        },
+        "termux-toast -s -g bottom -c text-color -b background-color text",
+    ),
+    ("torch", {}, "termux-torch on"),
+    ("torch", {"on": False}, "termux-torch off"),
+    ("tts_engines", {}, "termux-tts-engines"),
+    ("tts_speak", {"text": "text"}, "termux-tts-speak text"),
+    (
+        "tts_speak",
+        {
+            "text": "text",
+            "engine": "engine",
+            "language": "language",
+            "region": "region",
+            "variant": "variant",
+            "pitch": "pitch",
+            "rate": "rate",
+            "stream": "stream",
+            "timeout": 5,
+        },
+        "termux-tts-speak -e engine -l language -n region -v variant -p pitch -r rate -s stream text",
+    ),
+    ("tts_speak_init", {}, "termux-tts-speak"),
+    (
+        "tts_speak_init",
+        {
+            "engine": "engine",
+            "language": "language",
+            "region": "region",
+            "variant": "variant",
+            "pitch": "pitch",
+            "rate": "rate",
+            "stream": "stream",
+        },
+        "termux-tts-speak -e engine -l language -n region -v variant -p pitch -r rate -s stream",
+    ),
+    ("usb", {"device": "device"}, "termux-usb device"),
+    (
+        "usb",
+        {
+            "device": "device",
+            "permission_dialog": True,
+            "execute_command": "execute-command",
+        },
+        "termux-usb -r -e execute-command device",
+    ),
+    ("usb_list", {}, "termux-usb -l"),
+    ("vibrate", {}, "termux-vibrate"),
+    (
+        "vibrate",
+        {"duration": "duration", "force": True},
+        "termux-vibrate -f -d duration",
+    ),
+    ("volume_get", {}, "termux-volume"),
+    (
+        "volume_set",
+        {"stream": "stream", "volume": "volume"},
+        "termux-volume stream volume",
+    ),
+    ("wallpaper", {}, "termux-wallpaper"),
+    (
+        "wallpaper",
+        {"file": "file", "url": "url", "lockscreen": True},
+        "termux-wallpaper -l -f file -u url",
+    ),
+    ("wifi_connectioninfo", {}, "termux-wifi-connectioninfo"),
+    ("wifi_enable", {}, "termux-wifi-enable true"),
+    ("wifi_enable", {"enable": False}, "termux-wifi-enable false"),
+    ("wifi_scaninfo", {}, "termux-wifi-scaninfo"),
+    ("torch", {"on": True}, "termux-torch on"),
+    ("torch", {"on": None}, "termux-torch off"),
+    ("wifi_enable", {"enable": True}, "termux-wifi-enable true"),
+    ("wifi_enable", {"enable": None}, "termux-wifi-enable false"),
+]
+
+
+def _argv(args, **kwargs):
+    # stands in for _run() & _run_updates(): return argv as the error
+    return None, args
+
+
+class ArgvTest(unittest.TestCase):
+    def setUp(self):
+        for name, function in [("_run", _argv), ("_run_updates", _argv)]:
+            patcher = mock.patch.object(termux_api, name, side_effect=function)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def argv(self, name, kwargs):
+        if termux_api._SPECS_BY_NAME[name].parse is None:
+            # tts_speak_init() starts the command itself
+            values = inspect.signature(getattr(termux_api, name)).bind(**kwargs)
+            values.apply_defaults()
+            return termux_api._command(name)[0](values.args)
+        return getattr(termux_api, name)(**kwargs)[1]
+
+    def test_every_command(self):
+        self.assertEqual({case[0] for case in CASES}, set(termux_api._SPECS_BY_NAME))
+        for name, kwargs, argv in CASES:
+            with self.subTest(name=name, kwargs=kwargs):
+                if isinstance(argv, str):
+                    argv = argv.split()
+                self.assertEqual(self.argv(name, kwargs), argv)
+
+    def test_invalid_choices(self):
+        for name, kwargs in [
+            ("toast", {"text": "hi", "position": "left"}),
+            ("location", {"request": "always"}),
+            ("job_scheduler", {"script_path": "a.sh", "network": "wifi"}),
+        ]:
+            with self.subTest(name=name):
+                _, err = getattr(termux_api, name)(**kwargs)
+                self.assertIsInstance(err, ValueError)
+        termux_api._run.assert_not_called()
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        script = os.path.join(tmp.name, "termux-location")
+        with open(script, "w") as file:
+            file.write('#!/bin/sh\necho \'{"request": "\'"$4"\'"}\'\n')
+        os.chmod(script, 0o755)
+        environ = dict(os.environ)
+        self.addCleanup(os.environ.update, environ)
+        os.environ["PATH"] = tmp.name + os.pathsep + os.environ["PATH"]
+
+    def test_location_once(self):
+        location = termux_api.location
+        results = termux_api.batch(
+            [
+                [location],
+                [location, ["gps", "last"]],
+                [location, [], {"request": "updates"}],
+                [location, [], {"no_such": 1}],
+            ]
+        )
+        self.assertEqual(
+            results[:2], [({"request": "once"}, None), ({"request": "last"}, None)]
+        )
+        self.assertIsInstance(results[2][1], ValueError)
+        self.assertIsInstance(results[3][1], TypeError)
+        with self.assertRaises(ValueError):
+            termux_api.batch([[termux_api.sensor]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+_run_capture() against fake commands writing to the fifo, no device needed.
+
+run: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from termux_api import _run_capture  # noqa: E402
+
+# the last argument is the fifo, written like termux-api does after the command exits
+WRITE_LATER = """#!/bin/sh
+for fifo; do :; done
+(sleep 0.2; head -c "$1" /dev/zero > "$fifo") > /dev/null 2>&1 &
+"""
+# opened & closed without writing (like touch) before it is written
+TOUCH_THEN_WRITE = """#!/bin/sh
+for fifo; do :; done
+: > "$fifo"
+(sleep 0.2; head -c "$1" /dev/zero > "$fifo") > /dev/null 2>&1 &
+"""
+FAIL = """#!/bin/sh
+echo "Error: no camera 9"
+"""
+SILENT = """#!/bin/sh
+exit 0
+"""
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "fifo poll semantics of linux")
+class CaptureTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def command(self, script):
+        path = os.path.join(self.dir, f"command{len(os.listdir(self.dir))}")
+        with open(path, "w") as file:
+            file.write(script)
+        os.chmod(path, 0o755)
+        return path
+
+    def test_written_after_exit(self):
+        res, err = _run_capture([self.command(WRITE_LATER), 200000], timeout=10)
+        self.assertIsNone(err)
+        self.assertEqual(len(res), 200000)
+
+    def test_exact_size(self):
+        command = self.command(WRITE_LATER)
+        res, err = _run_capture([command, 1000], max_size=1000, timeout=10)
+        self.assertEqual((len(res), err), (1000, None))
+        buffer = bytearray(1000)
+        res, err = _run_capture([command, 1000], buffer, timeout=10)
+        self.assertIsNone(err)
+        self.assertTrue(res.obj is buffer)
+        self.assertEqual(len(res), 1000)
+
+    def test_exceeds(self):
+        command = self.command(WRITE_LATER)
+        res, err = _run_capture([command, 1001], max_size=1000, timeout=10)
+        self.assertIsNone(res)
+        self.assertEqual(err, "capture exceeds 1000 bytes")
+
+    def test_closed_without_writing(self):
+        res, err = _run_capture([self.command(TOUCH_THEN_WRITE), 1000], timeout=10)
+        self.assertEqual((bytes(res), err), (bytes(1000), None))
+        res, err = _run_capture([self.command(TOUCH_THEN_WRITE), 0], timeout=0.5)
+        self.assertIsNone(res)
+        self.assertEqual(type(err).__name__, "TimeoutExpired")
+
+    def test_not_installed(self):
+        fds = os.listdir("/proc/self/fd")
+        with self.assertRaises(FileNotFoundError):
+            _run_capture([os.path.join(self.dir, "missing")], timeout=10)
+        self.assertEqual(os.listdir("/proc/self/fd"), fds)
+
+    def test_error_before_opening(self):
+        start = time.monotonic()
+        res, err = _run_capture([self.command(FAIL)], timeout=10)
+        self.assertEqual((res, err), (None, "Error: no camera 9\n"))
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_timeout(self):
+        res, err = _run_capture([self.command(SILENT)], timeout=0.3)
+        self.assertIsNone(res)
+        self.assertEqual(type(err).__name__, "TimeoutExpired")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+python -m termux_api argument parsing & exit status, no device needed.
+
+run: python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import termux_api  # noqa: E402
+
+
+class CliTest(unittest.TestCase):
+    def main(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            status = termux_api._main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def test_args(self):
+        args, kwargs = termux_api._cli_args(
+            termux_api.notification,
+            ["t", "--vibrate", "1,2", "--sound", "--led-on=5", "--pin=false"],
+            termux_api._SPECS_BY_NAME["notification"],
+        )
+        self.assertEqual(args, ["t"])
+        self.assertEqual(
+            kwargs, {"vibrate": ["1", "2"], "sound": True, "led_on": "5", "pin": False}
+        )
+        args, kwargs = termux_api._cli_args(
+            termux_api.dialog_text,
+            ["--multi-line", "--title", "a,b"],
+            termux_api._SPECS_BY_NAME["dialog_text"],
+        )
+        self.assertEqual((args, kwargs), ([], {"multi_line": True, "title": "a,b"}))
+        args, kwargs = termux_api._cli_args(
+            termux_api.media_scan,
+            ["a,b", "--recursive"],
+            termux_api._SPECS_BY_NAME["media_scan"],
+        )
+        self.assertEqual((args, kwargs), ([["a", "b"]], {"recursive": True}))
+        args, kwargs = termux_api._cli_args(termux_api.call_log, ["5", "--limit=3"])
+        self.assertEqual((args, kwargs), ([5], {"limit": 3}))
+
+    def test_bad_arguments(self):
+        for argv in [
+            ["no-such-command"],
+            ["toast"],
+            ["toast", "hi", "--nope", "1"],
+            ["toast", "hi", "--position", "left"],
+        ]:
+            status, _, err = self.main(*argv)
+            self.assertEqual(status, 2, argv)
+            self.assertTrue(err, argv)
+
+    def test_command_not_installed(self):
+        environ = dict(os.environ)
+        self.addCleanup(os.environ.update, environ)
+        with tempfile.TemporaryDirectory() as empty:
+            os.environ["PATH"] = empty
+            status, _, err = self.main("termux-battery-status")
+        self.assertEqual(status, 1)
+        self.assertIn("termux-battery-status", err)
+
+    def test_help(self):
+        status, out, _ = self.main("toast", "--help")
+        self.assertEqual(status, 0)
+        self.assertIn("position='middle'", out)
+        status, out, err = self.main()
+        self.assertEqual((status, out), (2, ""))
+        self.assertIn("toast", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+sensor_features() windows against the statistics module, no device needed.
+
+run: python -m unittest discover tests
+"""
+
+import math
+import os
+import random
+import statistics
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from termux_api import _numpy, sensor_features  # noqa: E402
+
+
+def updates(rows, name="accel"):
+    for row in rows:
+        yield {name: {"values": row}}, None
+
+
+def expected(rows):
+    columns = list(zip(*rows))
+    return {
+        "mean": [statistics.fmean(c) for c in columns],
+        "var": [statistics.pvariance(c) for c in columns],
+        "rms": [math.sqrt(statistics.fmean(v * v for v in c)) for c in columns],
+        "min": [min(c) for c in columns],
+        "max": [max(c) for c in columns],
+    }
+
+
+class SensorFeaturesTest(unittest.TestCase):
+    def assertFeatures(self, features, rows):
+        for name, values in expected(rows).items():
+            for got, want in zip(features[name], values):
+                self.assertTrue(
+                    math.isclose(got, want, rel_tol=1e-9, abs_tol=1e-12),
+                    f"{name}: {got} != {want}",
+                )
+
+    def test_sliding(self):
+        random.seed(0)
+        rows = [[random.uniform(-10, 10) for _ in range(3)] for _ in range(200)]
+        results = list(sensor_features(updates(rows), size=16, step=5))
+        self.assertEqual(len(results), (200 - 16) // 5 + 1)
+        for i, (res, err) in enumerate(results):
+            self.assertIsNone(err)
+            end = 16 + 5 * i
+            self.assertFeatures(res["accel"], rows[end - 16 : end])
+
+    def test_tumbling(self):
+        rows = [[float(i), float(i % 7)] for i in range(40)]
+        results = list(sensor_features(updates(rows), size=10))
+        self.assertEqual(len(results), 4)
+        for i, (res, _) in enumerate(results):
+            self.assertFeatures(res["accel"], rows[10 * i : 10 * (i + 1)])
+
+    def test_variance_of_large_values(self):
+        # pressure around 1013 hPa with 1e-3 noise
+        random.seed(1)
+        rows = [[1013 + random.gauss(0, 1e-3)] for _ in range(1000)]
+        results = list(sensor_features(updates(rows), size=100, step=1))
+        for i, (res, _) in enumerate(results):
+            want = statistics.pvariance([r[0] for r in rows[i : i + 100]])
+            self.assertAlmostEqual(res["accel"]["var"][0] / want, 1, places=6)
+
+    def test_nan_leaves_window(self):
+        rows = [[1.0], [math.nan], [2.0], [3.0], [4.0], [5.0], [6.0]]
+        results = list(sensor_features(updates(rows), size=2, step=1))
+        self.assertTrue(math.isnan(results[0][0]["accel"]["mean"][0]))
+        self.assertEqual(results[-1][0]["accel"]["mean"], [5.5])
+
+    def test_errors_pass_through(self):
+        error = RuntimeError("stopped")
+        stream = [({"accel": {"values": [1.0]}}, None), (None, error)]
+        results = list(sensor_features(iter(stream), size=1, step=1))
+        self.assertEqual(results[1], (None, error))
+
+    def test_invalid_features(self):
+        with self.assertRaises(ValueError):
+            sensor_features(updates([]), 4, features=["median"])
+
+    def test_invalid_size(self):
+        for size, step in (0, None), (4, 0), (-1, 1):
+            with self.assertRaises(ValueError):
+                sensor_features(updates([]), size, step)
+
+    @unittest.skipIf(_numpy() is None, "numpy is not installed")
+    def test_fft_peak(self):
+        rows = [[math.sin(2 * math.pi * 4 * i / 32)] for i in range(32)]
+        res, _ = next(sensor_features(updates(rows), 32, features=["fft"]))
+        self.assertEqual(res["accel"]["fft_peak"], [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
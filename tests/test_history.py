@@ -0,0 +1,110 @@
+"""
+RingBuffer & History, no device needed.
+
+run: python -m unittest discover tests
+"""
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from termux_api import History, RingBuffer  # noqa: E402
+
+
+def accel(x, y=0.0, z=0.0):
+    return {"accel": {"values": [x, y, z]}}
+
+
+class RingBufferTest(unittest.TestCase):
+    def test_wraps_around(self):
+        buffer = RingBuffer(1, capacity=3)
+        for t in range(5):
+            buffer.append(t, [t * 10])
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.window(), ([2, 3, 4], [(20,), (30,), (40,)]))
+
+    def test_window_bounds_are_inclusive(self):
+        buffer = RingBuffer(1, capacity=8)
+        for t in range(8):
+            buffer.append(t, [t])
+        self.assertEqual(buffer.window(2, 4)[0], [2, 3, 4])
+        self.assertEqual(buffer.window(2.5, 3.5)[0], [3])
+        self.assertEqual(buffer.window(9, None), ([], []))
+
+    def test_earlier_timestamp_is_clamped(self):
+        buffer = RingBuffer(1)
+        buffer.append(5, [1])
+        buffer.append(3, [2])
+        self.assertEqual(buffer.window()[0], [5, 5])
+
+    def test_at(self):
+        buffer = RingBuffer(2)
+        self.assertIsNone(buffer.at(0))
+        buffer.append(0, [0, 10])
+        buffer.append(2, [4, 20])
+        self.assertEqual(buffer.at(1), (2, 15))
+        self.assertEqual(buffer.at(0.5, interpolate=False), (0, 10))
+        self.assertEqual(buffer.at(1.5, interpolate=False), (4, 20))
+        self.assertEqual(buffer.at(-1), (0, 10))
+        self.assertEqual(buffer.at(3), (4, 20))
+
+    def test_max_age(self):
+        buffer = RingBuffer(1, max_age=2)
+        for t in range(6):
+            buffer.append(t, [t])
+        self.assertEqual(buffer.window()[0], [3, 4, 5])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(1, capacity=0)
+        with self.assertRaises(ValueError):
+            RingBuffer(2).append(0, [1])
+
+
+class HistoryTest(unittest.TestCase):
+    def test_channels(self):
+        history = History()
+        history.add(accel(1), 1)
+        history.add({"latitude": 1.5, "longitude": 2.5, "altitude": None}, 2)
+        self.assertEqual(history.at("accel", 1), (1, 0, 0))
+        location = history.at("location", 2)
+        self.assertEqual(location[:2], (1.5, 2.5))
+        self.assertTrue(math.isnan(location[2]))
+        self.assertIsNone(history.at("gyro", 1))
+        self.assertEqual(history.window("gyro"), ([], []))
+
+    def test_last(self):
+        now = [0]
+        history = History(clock=lambda: now[0])
+        for now[0] in range(10):
+            history.add(accel(now[0]))
+        self.assertEqual(history.last("accel", 2)[0], [7, 8, 9])
+
+    def test_record_passes_through(self):
+        history = History()
+        error = RuntimeError("stopped")
+        updates = [(accel(1), None), (None, error), (accel(2), None)]
+        self.assertEqual(list(history.record(updates)), updates)
+        self.assertEqual(len(history.buffers["accel"]), 2)
+
+    def test_record_yields_add_errors(self):
+        history = History()
+        updates = [(accel(1), None), ({"accel": {"values": [1]}}, None)]
+        updates.append((accel(2), None))
+        results = list(history.record(updates))
+        self.assertEqual(len(results), 3)
+        self.assertIsNone(results[1][0])
+        self.assertIsInstance(results[1][1], ValueError)
+        self.assertEqual(results[2], updates[2])
+        self.assertEqual(len(history.buffers["accel"]), 2)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            History(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+job_scheduler_jobs() & job_scheduler_reconcile() against a fake termux-job-scheduler.
+
+run: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import termux_api  # noqa: E402
+
+HOME = "/data/data/com.termux/files/home"
+NETWORK_ANY = (
+    "NetworkRequest [ NONE id=0, [ Capabilities: INTERNET&NOT_RESTRICTED&TRUSTED "
+    "Uid: 10234 RequestorUid: -1 RequestorPackageName: null] ]"
+)
+# formatJobInfo() of termux-api: "Job %d: %s\t%s"
+PENDING = (
+    f"Pending Job 1: {HOME}/a.sh\t(periodic: 900000ms) (persisted) "
+    f"(battery not low) (network: {NETWORK_ANY})\n"
+    f"Pending Job 2: {HOME}/b b.sh\t(while charging) (network: null)\n"
+)
+PENDING_OLD_ANDROID = (
+    f"Pending Job 3: {HOME}/c.sh\t(periodic: 900000ms) (persisted)\n"
+    f"Pending Job 4: {HOME}/d.sh\t\n"
+)
+FAKE_SCHEDULER = """#!/bin/sh
+if [ "$1" = -p ]; then
+    cat "$FAKE_DIR/pending"
+else
+    echo "$@" >> "$FAKE_DIR/calls"
+fi
+"""
+
+
+class ParseJobsTest(unittest.TestCase):
+    def test_parse(self):
+        jobs = termux_api._parse_jobs(PENDING)
+        self.assertEqual(
+            jobs[0],
+            {
+                "job_id": 1,
+                "script_path": f"{HOME}/a.sh",
+                "period_ms": 900000,
+                "network": "any",
+                "charging": False,
+                "idle": False,
+                "persisted": True,
+                "battery_not_low": True,
+                "storage_not_low": False,
+            },
+        )
+        self.assertEqual(jobs[1]["script_path"], f"{HOME}/b b.sh")
+        self.assertEqual(jobs[1]["period_ms"], 0)
+        self.assertEqual(jobs[1]["network"], "none")
+        self.assertTrue(jobs[1]["charging"])
+        self.assertFalse(jobs[1]["battery_not_low"])
+
+    def test_old_android(self):
+        jobs = termux_api._parse_jobs(PENDING_OLD_ANDROID)
+        self.assertEqual(
+            [job["script_path"] for job in jobs], [f"{HOME}/c.sh", f"{HOME}/d.sh"]
+        )
+        self.assertEqual(jobs[0]["period_ms"], 900000)
+        self.assertTrue(jobs[0]["persisted"])
+        for job in jobs:
+            self.assertIsNone(job["network"])
+            self.assertIsNone(job["battery_not_low"])
+            self.assertIsNone(job["storage_not_low"])
+
+    def test_space_separated(self):
+        jobs = termux_api._parse_jobs(f"Job 5: {HOME}/e.sh (periodic: 900000ms)\n")
+        self.assertEqual(jobs[0]["script_path"], f"{HOME}/e.sh")
+        self.assertEqual(jobs[0]["period_ms"], 900000)
+
+    def test_no_jobs(self):
+        self.assertEqual(termux_api._parse_jobs("No pending jobs\n"), [])
+
+
+class ReconcileTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        script = os.path.join(self.dir, "termux-job-scheduler")
+        with open(script, "w") as file:
+            file.write(FAKE_SCHEDULER)
+        os.chmod(script, 0o755)
+        environ = dict(os.environ)
+        self.addCleanup(os.environ.update, environ)
+        self.addCleanup(os.environ.clear)
+        os.environ["PATH"] = self.dir + os.pathsep + os.environ["PATH"]
+        os.environ["FAKE_DIR"] = self.dir
+
+    def pending(self, text):
+        with open(os.path.join(self.dir, "pending"), "w") as file:
+            file.write(text)
+
+    def calls(self):
+        path = os.path.join(self.dir, "calls")
+        if not os.path.exists(path):
+            return []
+        with open(path) as file:
+            return file.read().splitlines()
+
+    def test_unchanged_jobs_are_kept(self):
+        self.pending(PENDING + PENDING_OLD_ANDROID)
+        desired = [
+            {
+                "job_id": 1,
+                "script_path": f"{HOME}/a.sh",
+                "period_ms": 60000,
+                "persisted": True,
+            },
+            {
+                "job_id": 2,
+                "script_path": f"{HOME}/b b.sh",
+                "network": "none",
+                "battery_not_low": False,
+                "charging": True,
+            },
+            # not persisted
+            {"job_id": 3, "script_path": f"{HOME}/c.sh", "period_ms": 900000},
+        ]
+        actions, err = termux_api.job_scheduler_reconcile(desired, dry_run=True)
+        self.assertIsNone(err)
+        self.assertEqual(actions, [("schedule", desired[2]), ("cancel", 4)])
+
+    def test_battery_not_low_unknown_on_old_android(self):
+        self.pending(PENDING_OLD_ANDROID)
+        desired = [
+            {"job_id": 3, "script_path": f"{HOME}/c.sh", "period_ms": 900000},
+            {"job_id": 4, "script_path": f"{HOME}/d.sh"},
+        ]
+        desired[0]["persisted"] = True
+        actions, err = termux_api.job_scheduler_reconcile(desired, dry_run=True)
+        self.assertEqual((actions, err), ([], None))
+
+    def test_network_none_is_any(self):
+        self.pending(PENDING)
+        desired = [
+            {"job_id": 1, "script_path": f"{HOME}/a.sh", "network": None},
+            {"job_id": 2, "script_path": f"{HOME}/b b.sh", "network": None},
+        ]
+        desired[0].update(period_ms=900000, persisted=True)
+        desired[1].update(battery_not_low=False, charging=True)
+        actions, err = termux_api.job_scheduler_reconcile(desired, dry_run=True)
+        self.assertEqual((actions, err), ([("schedule", desired[1])], None))
+
+    def test_apply(self):
+        self.pending(PENDING)
+        desired = [{"job_id": 1, "script_path": f"{HOME}/new.sh"}]
+        actions, err = termux_api.job_scheduler_reconcile(desired)
+        self.assertIsNone(err)
+        self.assertEqual(actions, [("schedule", desired[0]), ("cancel", 2)])
+        calls = self.calls()
+        self.assertEqual(len(calls), 2)
+        self.assertIn(f"-s {HOME}/new.sh --job-id 1", calls[0])
+        self.assertEqual(calls[1], "--cancel 2")
+
+    def test_invalid_jobs_are_returned_as_error(self):
+        self.pending(PENDING)
+        for desired in (
+            [{"script_path": "a.sh"}],
+            [{"job_id": 1, "path": "a.sh"}],
+            [{"job_id": 1, "script_path": "a.sh"}, {"job_id": 1, "script_path": "b"}],
+        ):
+            actions, err = termux_api.job_scheduler_reconcile(desired)
+            self.assertIsNone(actions)
+            self.assertIsInstance(err, (TypeError, ValueError))
+        self.assertEqual(self.calls(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
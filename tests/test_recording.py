@@ -0,0 +1,139 @@
+"""
+Recorder / Recording round trip & crash recovery, no device needed.
+
+run: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import termux_api  # noqa: E402
+from termux_api import _TRAILER, Recorder, Recording  # noqa: E402
+
+
+def accel(x):
+    return {"accel": {"values": [x, -x, 0.5]}}
+
+
+class RecordingTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "sensors.rec")
+
+    def record(self, timestamps, **kwargs):
+        with Recorder(self.path, **kwargs) as recorder:
+            for t in timestamps:
+                recorder.add(accel(t), t)
+
+    def read(self, channel="accel", start=None, end=None):
+        with Recording(self.path) as recording:
+            times, values = recording.read(channel, start, end)
+        return list(times), list(values)
+
+    def test_round_trip(self):
+        self.record(range(10), chunk_size=3)
+        times, values = self.read()
+        self.assertEqual(times, list(range(10)))
+        self.assertEqual(values[:6], [0, 0, 0.5, 1, -1, 0.5])
+        with Recording(self.path) as recording:
+            self.assertEqual(recording.channels, {"accel": (3, "f")})
+
+    def test_time_range(self):
+        self.record(range(10), chunk_size=3)
+        self.assertEqual(self.read(start=2, end=7)[0], [2, 3, 4, 5, 6, 7])
+        self.assertEqual(self.read(start=2.5, end=2.7)[0], [])
+        self.assertEqual(self.read(start=20)[0], [])
+        self.assertEqual(self.read("gyro", start=1), ([], []))
+
+    def test_location_is_float64(self):
+        with Recorder(self.path) as recorder:
+            recorder.add({"latitude": 25.0330001, "longitude": 121.5654001}, 1)
+        with Recording(self.path) as recording:
+            self.assertEqual(recording.channels["location"], (6, "d"))
+            self.assertEqual(
+                list(recording.read("location")[1][:2]), [25.0330001, 121.5654001]
+            )
+
+    def test_append_session_keeps_time_order(self):
+        self.record([10, 11, 12, 13], chunk_size=2)
+        self.record([0, 1, 2, 3], chunk_size=2)
+        times, _ = self.read()
+        self.assertEqual(times, [10, 11, 12, 13, 13, 13, 13, 13])
+        self.assertEqual(self.read(start=12, end=12)[0], [12])
+
+    def test_unordered_chunks(self):
+        # files written before the last timestamp was recovered
+        self.record([10, 11, 12, 13], chunk_size=2)
+        with Recorder(self.path, chunk_size=2) as recorder:
+            recorder._last.clear()
+            for t in range(4):
+                recorder.add(accel(t), t)
+        self.assertEqual(self.read(start=0, end=2)[0], [0, 1, 2])
+        self.assertEqual(self.read(start=11)[0], [11, 12, 13])
+
+    def test_recover_unclosed(self):
+        self.record(range(6), chunk_size=2)
+        # a crash while writing: no index, half a chunk
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(size - _TRAILER.size)
+            index = _TRAILER.unpack(file.read())[0]
+            file.truncate(index - 5)
+        self.assertEqual(self.read()[0], [0, 1, 2, 3])
+        self.record([6, 7], chunk_size=2)
+        self.assertEqual(self.read()[0], [0, 1, 2, 3, 6, 7])
+
+    def test_index_has_the_channels(self):
+        self.record(range(10), chunk_size=3)
+        with mock.patch.object(termux_api, "_chunk_layout", side_effect=AssertionError):
+            with Recording(self.path) as recording:
+                self.assertEqual(recording.channels, {"accel": (3, "f")})
+            Recorder(self.path).close()
+        self.assertEqual(self.read(start=8)[0], [8, 9])
+
+    def test_append_session_keeps_channels(self):
+        self.record([0, 1], dtype="d")
+        with Recorder(self.path) as recorder:
+            with self.assertRaises(ValueError):
+                recorder.add({"accel": {"values": [1, 2]}}, 2)
+            recorder.add(accel(2.1), 2)
+        with Recording(self.path) as recording:
+            self.assertEqual(recording.channels, {"accel": (3, "d")})
+            self.assertEqual(list(recording.read("accel")[1][-3:]), [2.1, -2.1, 0.5])
+
+    def test_read_while_recording(self):
+        recorder = Recorder(self.path, chunk_size=2)
+        self.addCleanup(recorder.close)
+        self.assertEqual(self.read(), ([], []))
+        for t in range(3):
+            recorder.add(accel(t), t)
+        recorder.flush()
+        self.assertEqual(self.read()[0], [0, 1, 2])
+
+    def test_record_yields_add_errors(self):
+        updates = [(accel(1), None), ({"accel": {"values": [1]}}, None)]
+        with Recorder(self.path) as recorder:
+            results = list(recorder.record(updates))
+        self.assertEqual(results[0], updates[0])
+        self.assertIsInstance(results[1][1], ValueError)
+
+    def test_not_a_recording(self):
+        open(self.path, "wb").close()
+        with self.assertRaises(ValueError):
+            Recording(self.path)
+        with open(self.path, "wb") as file:
+            file.write(b"not a recording")
+        with self.assertRaises(ValueError):
+            Recording(self.path)
+        with self.assertRaises(ValueError):
+            Recorder(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()